@@ -2,12 +2,21 @@
 Функции:
 - mod_pow(a, x, p): быстрое возведение в степень по модулю, возвращает a^x mod p.
   Поддерживает отрицательные x (через модульную обратную при существовании).
+  Использует метод скользящего окна, ширина окна выбирается по длине показателя.
+- mod_pow_binary(a, x, p): прежний бинарный алгоритм (для сравнения).
+- FixedBasePow(g, p): таблица предвычисленных степеней фиксированного основания g,
+  FixedBasePow(g, p).pow(x) возвращает g^x mod p без возведений в квадрат.
+- ModContext(n): арифметика по нечётному модулю n в форме Монтгомери
+  (mul/sqr/pow/batch_pow, перевод в обычную форму только на границе).
+- multi_pow(pairs, p): произведение g1^e1 * ... * gk^ek mod p за один проход (трюк Штрауса).
 - mod_inv(a, p): модульная обратная числа a по модулю p (возвращает x: a*x ≡ 1 (mod p)),
   либо возбуждает ValueError, если обратной не существует.
-- is_probable_prime(n, k=5): вероятностный тест простоты (Miller–Rabin).
+- is_probable_prime(n, k=None): тест простоты Миллера–Рабина с отсевом по малым простым
+  (один gcd), детерминированными основаниями для n < 3.3·10^24 и числом раундов по длине n.
 - is_probable_prime_fermat(n, k=5): тест простоты Ферма с высокой вероятностью.
+- mod_inv_batch(values, p): обратные элементы для списка values одной инверсией.
 - Добавлена функция обобщённого алгоритма Евклида для нахождения НОД(a, b) и
-коэффициентов x, y из уравнения a*x + b*y = НОД(a, b).
+коэффициентов x, y из уравнения a*x + b*y = НОД(a, b) (итеративно, с ускорением Лемера).
 
 Меню:
 1) Возведение в степень по модулю
@@ -15,17 +24,80 @@
 3) Проверка числа на простоту
 4) Проверка числа на простоту (Ферма)
 5) Обобщённый алгоритм Евклида (НОД + x, y)
+6) Бенчмарк возведения в степень
+7) Бенчмарк арифметики Монтгомери
 0) Выход
 """
 
+import math
 import random
-from typing import Tuple
+import time
+from typing import Tuple, Dict, Iterable, List
 
 # -------------------------
 # Core algorithms
 # -------------------------
 
+def _window_size(bits: int) -> int:
+    """
+    Ширина окна k для показателя длиной bits бит.
+    Минимизирует число умножений: 2^(k-1) предвычислений + bits/(k+1) умножений окна.
+    """
+    best_k, best_cost = 1, bits
+    for k in range(2, 9):
+        cost = (1 << (k - 1)) + bits / (k + 1)
+        if cost < best_cost:
+            best_k, best_cost = k, cost
+    return best_k
+
+def _sliding_window_pow(base: int, exp: int, p: int) -> int:
+    """Возведение base^exp mod p методом скользящего окна (exp >= 0, 0 <= base < p)."""
+    if exp == 0:
+        return 1 % p
+    bits = bin(exp)[2:]
+    k = _window_size(len(bits))
+    # Нечётные степени: base^1, base^3, ..., base^(2^k - 1)
+    table = [base]
+    if k > 1:
+        sq = (base * base) % p
+        for _ in range((1 << (k - 1)) - 1):
+            table.append((table[-1] * sq) % p)
+    result = None
+    i = 0
+    n = len(bits)
+    while i < n:
+        if bits[i] == "0":
+            result = (result * result) % p
+            i += 1
+            continue
+        # окно bits[i:j] длиной не более k, заканчивающееся единицей
+        j = min(i + k, n)
+        while bits[j - 1] == "0":
+            j -= 1
+        window = int(bits[i:j], 2)
+        if result is None:
+            result = table[window >> 1]
+        else:
+            for _ in range(j - i):
+                result = (result * result) % p
+            result = (result * table[window >> 1]) % p
+        i = j
+    return result
+
 def mod_pow(a: int, x: int, p: int) -> int:
+    if p <= 0:
+        raise ValueError("Модуль p должен быть положительным целым числом.")
+    a = a % p
+    if p == 1:
+        return 0
+    if x < 0:
+        inv = mod_inv(a, p)
+        x = -x
+        a = inv
+    return _sliding_window_pow(a, x, p)
+
+def mod_pow_binary(a: int, x: int, p: int) -> int:
+    """Прежняя реализация: бинарный алгоритм справа налево (для сравнения в бенчмарке)."""
     if p <= 0:
         raise ValueError("Модуль p должен быть положительным целым числом.")
     a = a % p
@@ -45,13 +117,64 @@ def mod_pow(a: int, x: int, p: int) -> int:
         exp >>= 1
     return result
 
+_LEHMER_DIGIT_BITS = 62
+
+def _lehmer_extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
+    """
+    Расширенный алгоритм Евклида с ускорением Лемера для a >= b >= 0.
+    Пока числа длинные, последовательность частных моделируется на старших
+    62 битах машинными (малыми) числами, а к длинным числам применяется
+    накопленная матрица 2x2 — одно длинное умножение вместо многих делений.
+    """
+    u0, u1 = 1, 0
+    v0, v1 = 0, 1
+    while b.bit_length() > _LEHMER_DIGIT_BITS:
+        shift = a.bit_length() - _LEHMER_DIGIT_BITS
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C != 0 and bh + D != 0:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            u0, u1 = u1, u0 - q * u1
+            v0, v1 = v1, v0 - q * v1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            u0, u1 = A * u0 + B * u1, C * u0 + D * u1
+            v0, v1 = A * v0 + B * v1, C * v0 + D * v1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        u0, u1 = u1, u0 - q * u1
+        v0, v1 = v1, v0 - q * v1
+    return (a, u0, v0)
+
 def extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
-    if b == 0:
-        return (abs(a), 1 if a >= 0 else -1, 0)
-    g, x1, y1 = extended_gcd(b, a % b)
-    x = y1
-    y = x1 - (a // b) * y1
-    return (g, x, y)
+    """
+    Обобщённый алгоритм Евклида без рекурсии: возвращает (g, x, y), a*x + b*y = g.
+    Для неотрицательных a, b используется ускорение Лемера.
+    """
+    if a >= 0 and b >= 0:
+        if a >= b:
+            return _lehmer_extended_gcd(a, b)
+        g, x, y = _lehmer_extended_gcd(b, a)
+        return (g, y, x)
+    x0, x1 = 1, 0
+    y0, y1 = 0, 1
+    while b != 0:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        return (-a, -x0, -y0)
+    return (a, x0, y0)
 
 def mod_inv(a: int, p: int) -> int:
     if p <= 0:
@@ -62,33 +185,344 @@ def mod_inv(a: int, p: int) -> int:
         raise ValueError(f"Обратной не существует, gcd({a},{p}) = {g} ≠ 1.")
     return x % p
 
-def is_probable_prime(n: int, k: int = 5) -> bool:
-    """Вероятностный тест Миллера–Рабина"""
+def mod_inv_batch(values: List[int], p: int) -> List[int]:
+    """
+    Обратные элементы для всех values по модулю p (трюк Монтгомери):
+    одна модульная инверсия и 3(N-1) умножений вместо N инверсий.
+    Возбуждает ValueError, если хотя бы один элемент необратим.
+    """
+    if p <= 0:
+        raise ValueError("Модуль p должен быть положительным целым числом.")
+    values = [v % p for v in values]
+    if not values:
+        return []
+    prefix = []
+    acc = 1 % p
+    for v in values:
+        acc = (acc * v) % p
+        prefix.append(acc)
+    try:
+        inv = mod_inv(acc, p)
+    except ValueError:
+        for v in values:
+            g = math.gcd(v, p)
+            if g != 1:
+                raise ValueError(f"Обратной не существует, gcd({v},{p}) = {g} ≠ 1.")
+        raise
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = (inv * prefix[i - 1]) % p
+        inv = (inv * values[i]) % p
+    result[0] = inv
+    return result
+
+class FixedBasePow:
+    """
+    Возведение фиксированного основания g в произвольные степени по модулю p
+    с предвычисленной таблицей (оконный метод с фиксированным основанием).
+
+    table[i][d-1] = g^(d * 2^(w*i)) mod p, d = 1..2^w-1, поэтому g^x считается
+    за ceil(bits/w) умножений без возведений в квадрат. Таблица строится один раз
+    на пару (g, p) и переиспользуется для всех последующих показателей.
+
+    Объём таблицы: ceil(max_bits/w) * (2^w - 1) вычетов. Ширина окна w задаётся явно
+    (window) либо выбирается как наибольшая (не более 8), при которой таблица
+    укладывается в max_bytes. max_bytes — жёсткий предел: если в него не укладывается
+    даже w = 1, таблица не строится и все степени считаются обычным mod_pow; явно
+    заданное окно, превышающее предел, — ValueError. Показатели длиннее max_bits
+    и отрицательные показатели также обрабатываются обычным mod_pow.
+    """
+
+    def __init__(self, g: int, p: int, max_bits: int = None, window: int = None, max_bytes: int = 4 << 20):
+        if p <= 0:
+            raise ValueError("Модуль p должен быть положительным целым числом.")
+        self.g = g % p
+        self.p = p
+        self.max_bits = max_bits if max_bits is not None else p.bit_length()
+        entry_bytes = (p.bit_length() + 7) // 8 or 1
+        def table_bytes(w: int) -> int:
+            return max(1, -(-self.max_bits // w)) * ((1 << w) - 1) * entry_bytes
+        self.table = []
+        if window is None:
+            fitting = [w for w in range(1, 9) if table_bytes(w) <= max_bytes]
+            if not fitting:
+                self.window = 0
+                self.memory_bytes = 0
+                return
+            window = fitting[-1]
+        if window < 1:
+            raise ValueError("Ширина окна должна быть >= 1.")
+        if table_bytes(window) > max_bytes:
+            raise ValueError(f"Таблица с окном {window} ({table_bytes(window)} байт) превышает max_bytes = {max_bytes}.")
+        self.window = window
+        rows = max(1, -(-self.max_bits // window))
+        base = self.g
+        for _ in range(rows):
+            row = [base]
+            for _ in range((1 << window) - 2):
+                row.append((row[-1] * base) % p)
+            self.table.append(row)
+            base = (row[-1] * base) % p
+        self.memory_bytes = rows * ((1 << window) - 1) * entry_bytes
+
+    def pow(self, x: int) -> int:
+        """Возвращает g^x mod p."""
+        if not self.table or x < 0 or x.bit_length() > self.max_bits:
+            return mod_pow(self.g, x, self.p)
+        p = self.p
+        mask = (1 << self.window) - 1
+        result = 1 % p
+        for row in self.table:
+            if not x:
+                break
+            d = x & mask
+            if d:
+                result = (result * row[d - 1]) % p
+            x >>= self.window
+        return result
+
+def _sieve_primes(limit: int) -> List[int]:
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Первые 2048 простых (до 17863) и их произведение для отсева одним gcd
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# Доказанные детерминированные наборы оснований Миллера–Рабина: (граница n, основания)
+_MR_DETERMINISTIC_BASES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+def _mr_rounds_for_bits(bits: int) -> int:
+    """Число раундов со случайными основаниями для случайного кандидата (ошибка < 2^-128)."""
+    if bits >= 3747:
+        return 3
+    if bits >= 1345:
+        return 4
+    if bits >= 476:
+        return 5
+    if bits >= 400:
+        return 6
+    if bits >= 347:
+        return 7
+    if bits >= 308:
+        return 8
+    return 27
+
+def _miller_rabin_round(n: int, d: int, s: int, a: int) -> bool:
+    """Один раунд Миллера–Рабина по основанию a (n - 1 = d * 2^s). True — n прошло раунд."""
+    x = mod_pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = (x * x) % n
+        if x == n - 1:
+            return True
+    return False
+
+class ModContext:
+    """
+    Арифметика по фиксированному нечётному модулю n в форме Монтгомери.
+
+    Вычет a хранится как a*R mod n, R = 2^k (k — битовая длина n). Умножение
+    заменяет деление на n сдвигом и маскированием (редукция Монтгомери REDC),
+    поэтому цепочки mul/sqr/pow ведутся в форме Монтгомери, а перевод в обычную
+    форму выполняется только на границе (to_mont / from_mont).
+
+    В CPython деление длинных чисел реализовано в C, поэтому REDC (три длинных
+    умножения на уровне интерпретатора) выигрывает у встроенного % лишь для
+    очень длинных модулей — см. benchmark_mod_context.
+    """
+
+    def __init__(self, n: int):
+        if n <= 1 or n % 2 == 0:
+            raise ValueError("Модуль для формы Монтгомери должен быть нечётным и > 1.")
+        self.n = n
+        self.k = n.bit_length()
+        self.mask = (1 << self.k) - 1
+        # n * n_prime ≡ -1 (mod R)
+        self.n_prime = (-mod_inv(n, 1 << self.k)) & self.mask
+        self.r2 = (1 << (2 * self.k)) % n
+        self.one = (1 << self.k) % n
+
+    def redc(self, t: int) -> int:
+        """Редукция Монтгомери: t * R^-1 mod n для 0 <= t < n*R."""
+        u = (t + (((t & self.mask) * self.n_prime) & self.mask) * self.n) >> self.k
+        return u - self.n if u >= self.n else u
+
+    def to_mont(self, a: int) -> int:
+        """Перевод в форму Монтгомери: a*R mod n."""
+        return self.redc((a % self.n) * self.r2)
+
+    def from_mont(self, a: int) -> int:
+        """Перевод из формы Монтгомери в обычную."""
+        return self.redc(a)
+
+    def mul(self, a: int, b: int) -> int:
+        """Произведение двух вычетов в форме Монтгомери."""
+        return self.redc(a * b)
+
+    def sqr(self, a: int) -> int:
+        """Квадрат вычета в форме Монтгомери."""
+        return self.redc(a * a)
+
+    def _plan(self, e: int) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Разбиение показателя на окна: список (число возведений в квадрат, индекс нечётной степени)."""
+        bits = bin(e)[2:]
+        k = _window_size(len(bits))
+        plan = []
+        i = 0
+        zeros = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                zeros += 1
+                i += 1
+                continue
+            j = min(i + k, len(bits))
+            while bits[j - 1] == "0":
+                j -= 1
+            plan.append((zeros + (j - i), int(bits[i:j], 2) >> 1))
+            zeros = 0
+            i = j
+        return plan, k, zeros
+
+    def _run_plan(self, a_m: int, plan: List[Tuple[int, int]], k: int, tail_zeros: int) -> int:
+        redc = self.redc
+        table = [a_m]
+        if k > 1:
+            sq = redc(a_m * a_m)
+            for _ in range((1 << (k - 1)) - 1):
+                table.append(redc(table[-1] * sq))
+        result = None
+        for squarings, idx in plan:
+            if result is None:
+                result = table[idx]
+                continue
+            for _ in range(squarings):
+                result = redc(result * result)
+            result = redc(result * table[idx])
+        for _ in range(tail_zeros):
+            result = redc(result * result)
+        return result
+
+    def pow_mont(self, a_m: int, e: int) -> int:
+        """a^e для a в форме Монтгомери, e >= 0; результат в форме Монтгомери."""
+        if e == 0:
+            return self.one
+        plan, k, tail = self._plan(e)
+        return self._run_plan(a_m, plan, k, tail)
+
+    def pow(self, a: int, e: int) -> int:
+        """a^e mod n в обычной форме (отрицательный e — через обратный элемент)."""
+        if e < 0:
+            a = mod_inv(a, self.n)
+            e = -e
+        return self.from_mont(self.pow_mont(self.to_mont(a), e))
+
+    def batch_pow(self, bases: List[int], e: int) -> List[int]:
+        """
+        [b^e mod n for b in bases]: разбиение показателя на окна строится один раз,
+        одинаковые основания возводятся в степень один раз.
+        """
+        if e < 0:
+            bases = mod_inv_batch(bases, self.n)
+            e = -e
+        if e == 0:
+            return [1 % self.n for _ in bases]
+        plan, k, tail = self._plan(e)
+        cache: Dict[int, int] = {}
+        result = []
+        for b in bases:
+            b %= self.n
+            if b not in cache:
+                cache[b] = self.from_mont(self._run_plan(self.to_mont(b), plan, k, tail))
+            result.append(cache[b])
+        return result
+
+# Для модулей до этой длины два встроенных pow быстрее интерпретируемого цикла Штрауса
+MULTI_POW_MIN_BITS = 256
+
+def multi_pow(pairs: List[Tuple[int, int]], p: int) -> int:
+    """
+    Одновременное возведение в степень (трюк Шамира/Штрауса):
+    g1^e1 * g2^e2 * ... * gk^ek mod p за один проход с общей цепочкой возведений в квадрат.
+    Показатели обрабатываются окнами по w бит, для каждого основания — таблица g^0..g^(2^w-1).
+    Отрицательные показатели обрабатываются через обратный элемент.
+    """
+    if p <= 0:
+        raise ValueError("Модуль p должен быть положительным целым числом.")
+    pairs = [(mod_inv(g, p), -e) if e < 0 else (g, e) for g, e in pairs]
+    if p.bit_length() <= MULTI_POW_MIN_BITS:
+        result = 1 % p
+        for g, e in pairs:
+            result = (result * pow(g, e, p)) % p
+        return result
+    pairs = [(g % p, e) for g, e in pairs if e]
+    if not pairs:
+        return 1 % p
+    bits = max(e.bit_length() for _, e in pairs)
+    w = 1 if bits <= 8 else 2 if bits <= 24 else 3 if bits <= 80 else 4 if bits <= 240 else 5
+    tables = []
+    for g, _ in pairs:
+        table = [1, g]
+        for _ in range((1 << w) - 2):
+            table.append((table[-1] * g) % p)
+        tables.append(table)
+    mask = (1 << w) - 1
+    result = 1
+    for i in range((bits + w - 1) // w - 1, -1, -1):
+        if result != 1:
+            for _ in range(w):
+                result = (result * result) % p
+        shift = i * w
+        for (_, e), table in zip(pairs, tables):
+            d = (e >> shift) & mask
+            if d:
+                result = (result * table[d]) % p
+    return result % p
+
+def is_probable_prime(n: int, k: int = None) -> bool:
+    """
+    Тест простоты Миллера–Рабина с предварительным отсевом.
+    1) Делимость на первые 2048 простых проверяется одним gcd с их произведением.
+    2) Для n < 3.3·10^24 используются доказанные детерминированные наборы оснований
+       (результат точный, k не используется).
+    3) Для больших n выполняется k раундов со случайными основаниями; если k не задано,
+       число раундов выбирается по битовой длине n.
+    """
     if n < 2:
         return False
-    small_primes = [2,3,5,7,11,13,17,19,23,29]
-    for p in small_primes:
-        if n == p:
-            return True
-        if n % p == 0:
-            return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if math.gcd(n, _PRIMORIAL) != 1:
+        return False
+    # write n-1 as d * 2^s
     d = n - 1
-    s = 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    for _ in range(k):
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for bound, bases in _MR_DETERMINISTIC_BASES:
+        if n < bound:
+            return all(_miller_rabin_round(n, d, s, a) for a in bases)
+    rounds = k if k is not None else _mr_rounds_for_bits(n.bit_length())
+    for _ in range(rounds):
         a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        composite = True
-        for _ in range(s - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                composite = False
-                break
-        if composite:
+        if not _miller_rabin_round(n, d, s, a):
             return False
     return True
 
@@ -128,6 +562,66 @@ def generalized_euclid(a: int = None, b: int = None, prime_only=False) -> Tuple[
     gcd, x, y = extended_gcd(a, b)
     return gcd, x, y, a, b
 
+# -------------------------
+# Benchmark
+# -------------------------
+
+def benchmark_mod_pow(bit_sizes: Iterable[int] = (1024, 2048, 4096), repeats: int = 3) -> Dict[int, Dict[str, float]]:
+    """
+    Сравнивает mod_pow (скользящее окно), mod_pow_binary (прежний цикл) и встроенный pow
+    на случайных операндах заданной битовой длины. Возвращает среднее время (сек) на вызов.
+    """
+    impls = [("mod_pow", mod_pow), ("mod_pow_binary", mod_pow_binary), ("pow", pow)]
+    results: Dict[int, Dict[str, float]] = {}
+    print(f"{'бит':>6} | " + " | ".join(f"{name:>14}" for name, _ in impls) + " | ускорение")
+    for bits in bit_sizes:
+        p = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        cases = [(random.randrange(2, p), random.getrandbits(bits)) for _ in range(repeats)]
+        row: Dict[str, float] = {}
+        for name, fn in impls:
+            start = time.perf_counter()
+            for a, x in cases:
+                fn(a, x, p)
+            row[name] = (time.perf_counter() - start) / repeats
+        results[bits] = row
+        speedup = row["mod_pow_binary"] / row["mod_pow"]
+        print(f"{bits:>6} | " + " | ".join(f"{row[name] * 1000:>11.3f} мс" for name, _ in impls) + f" | x{speedup:.2f}")
+    return results
+
+def benchmark_mod_context(bit_sizes: Iterable[int] = (256, 1024, 2048, 4096, 8192, 16384, 32768), ops: int = 200) -> Dict[int, Dict[str, float]]:
+    """
+    Сравнивает ModContext со встроенным %: цепочку из ops умножений (x*y % n против
+    ModContext.mul) и возведение в степень (mod_pow, ModContext.pow, встроенный pow).
+    Возвращает время (сек) на одно умножение / одно возведение.
+    """
+    results: Dict[int, Dict[str, float]] = {}
+    print(f"{'бит':>6} | {'x*y % n':>12} | {'ctx.mul':>12} | {'mod_pow':>12} | {'ctx.pow':>12} | {'pow':>12}")
+    for bits in bit_sizes:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        ctx = ModContext(n)
+        x, y = random.randrange(n), random.randrange(n)
+        row: Dict[str, float] = {}
+        start = time.perf_counter()
+        acc = x
+        for _ in range(ops):
+            acc = (acc * y) % n
+        row["mul %"] = (time.perf_counter() - start) / ops
+        xm, ym = ctx.to_mont(x), ctx.to_mont(y)
+        start = time.perf_counter()
+        acc = xm
+        for _ in range(ops):
+            acc = ctx.mul(acc, ym)
+        row["ctx.mul"] = (time.perf_counter() - start) / ops
+        e = random.getrandbits(min(bits, 1024))
+        for name, fn in (("mod_pow", lambda: mod_pow(x, e, n)), ("ctx.pow", lambda: ctx.pow(x, e)), ("pow", lambda: pow(x, e, n))):
+            start = time.perf_counter()
+            fn()
+            row[name] = time.perf_counter() - start
+        results[bits] = row
+        print(f"{bits:>6} | {row['mul %'] * 1e6:>9.2f} мкс | {row['ctx.mul'] * 1e6:>9.2f} мкс | "
+              f"{row['mod_pow'] * 1e3:>9.2f} мс | {row['ctx.pow'] * 1e3:>9.2f} мс | {row['pow'] * 1e3:>9.2f} мс")
+    return results
+
 # -------------------------
 # Interactive menu
 # -------------------------
@@ -140,6 +634,8 @@ def main():
         print("3) Проверка числа на простоту (Miller–Rabin)")
         print("4) Проверка числа на простоту (Ферма)")
         print("5) Обобщённый алгоритм Евклида (НОД + x, y)")
+        print("6) Бенчмарк возведения в степень (окно / бинарный / pow)")
+        print("7) Бенчмарк арифметики Монтгомери (ModContext / встроенный %)")
         print("0) Выход")
         choice = input("Ваш выбор: ").strip()
 
@@ -165,8 +661,8 @@ def main():
         elif choice == "3":
             try:
                 n = int(input("Введите n: "))
-                k = int(input("Введите количество итераций теста (например 5): "))
-                res = is_probable_prime(n, k)
+                k_str = input("Количество итераций теста (Enter — по длине n): ").strip()
+                res = is_probable_prime(n, int(k_str) if k_str else None)
                 print("Вероятно простое" if res else "Составное")
             except ValueError as e:
                 print("Ошибка:", e)
@@ -188,6 +684,12 @@ def main():
             except ValueError as e:
               print("Ошибка:", e)
 
+        elif choice == "6":
+            benchmark_mod_pow()
+
+        elif choice == "7":
+            benchmark_mod_context()
+
         elif choice == "0":
             print("Выход.")
             break
@@ -3,15 +3,92 @@ from Crypto.Random import random
 from Crypto.Util.number import getPrime, inverse
 from Crypto.Util.number import isPrime
 import os
-
-
-def generate_parameters(bits_p=512, bits_q=160):
-    while True:
-        q = getPrime(bits_q)
-        k = random.getrandbits(bits_p - bits_q)
+import queue
+from multiprocessing import Pool
+
+
+def _first_result(task, args, workers=None):
+    """
+    Запускает task(*args) в пуле процессов, пока одно из заданий не вернёт не None.
+    После первого успеха пул завершается (terminate), остальные задания отменяются.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = queue.Queue()
+    with Pool(workers) as pool:
+        def submit():
+            pool.apply_async(task, args, callback=results.put, error_callback=results.put)
+        for _ in range(2 * workers):
+            submit()
+        while True:
+            r = results.get()
+            if isinstance(r, BaseException):
+                raise r
+            if r is not None:
+                return r
+            submit()
+
+def _search_p_task(q, k_bits, batch):
+    # batch попыток p = k*q + 1 со случайным k; простое p или None
+    for _ in range(batch):
+        k = random.getrandbits(k_bits)
         p = k * q + 1
         if is_prime(p):
-            break
+            return p
+    return None
+
+# Для модулей до этой длины два встроенных pow быстрее интерпретируемого цикла Штрауса
+MULTI_POW_MIN_BITS = 256
+
+def multi_pow(pairs, p):
+    """
+    g1^e1 * g2^e2 * ... mod p за один проход с общей цепочкой возведений в квадрат
+    (трюк Шамира/Штрауса), показатели e >= 0.
+    """
+    if p.bit_length() <= MULTI_POW_MIN_BITS:
+        result = 1 % p
+        for g, e in pairs:
+            result = (result * pow(g, e, p)) % p
+        return result
+    pairs = [(g % p, e) for g, e in pairs if e]
+    if not pairs:
+        return 1 % p
+    bits = max(e.bit_length() for _, e in pairs)
+    w = 1 if bits <= 8 else 2 if bits <= 24 else 3 if bits <= 80 else 4 if bits <= 240 else 5
+    tables = []
+    for g, _ in pairs:
+        table = [1, g]
+        for _ in range((1 << w) - 2):
+            table.append((table[-1] * g) % p)
+        tables.append(table)
+    mask = (1 << w) - 1
+    result = 1
+    for i in range((bits + w - 1) // w - 1, -1, -1):
+        if result != 1:
+            for _ in range(w):
+                result = (result * result) % p
+        shift = i * w
+        for (_, e), table in zip(pairs, tables):
+            d = (e >> shift) & mask
+            if d:
+                result = (result * table[d]) % p
+    return result % p
+
+# Пул процессов окупается, только если последовательный поиск заметно дольше его
+# запуска и остановки (15-60 мс): по benchmark_parallel_keygen (Лаб.8) — с 768 бит.
+# На одноядерной машине (workers = cpu_count() = 1) поиск всегда последовательный.
+PARALLEL_MIN_BITS = 768
+
+def generate_parameters(bits_p=512, bits_q=160, workers=1):
+    if workers > 1 and bits_p >= PARALLEL_MIN_BITS:
+        q = getPrime(bits_q)
+        p = _first_result(_search_p_task, (q, bits_p - bits_q, 16), workers)
+    else:
+        while True:
+            q = getPrime(bits_q)
+            k = random.getrandbits(bits_p - bits_q)
+            p = k * q + 1
+            if is_prime(p):
+                break
     while True:
         g = random.randint(2, p - 2)
         a = pow(g, (p - 1) // q, p)
@@ -46,7 +123,7 @@ def verify_byte(byte, r, s, y, p, q, a):
     v = inverse(h, q)
     z1 = (s * v) % q
     z2 = (-r * v) % q
-    u = (pow(a, z1, p) * pow(y, z2, p)) % p % q
+    u = multi_pow([(a, z1), (y, z2)], p) % q
     return u == r
 
 def sign_file(filename, x, p, q, a):
@@ -110,7 +187,7 @@ def main():
 
     if action == "1":
         print("Генерация параметров ГОСТ (может занять время)...")
-        p, q, a = generate_parameters(bits_p=512, bits_q=160)  # можно 1024/160 для реальной версии
+        p, q, a = generate_parameters(bits_p=512, bits_q=160, workers=os.cpu_count() or 1)  # можно 1024/160 для реальной версии
         print("Параметры сгенерированы.")
         x, y = generate_keys(p, q, a)
         save_keys(x, y, p, q, a)
@@ -7,24 +7,44 @@
 
 import hashlib
 import random
+from math import gcd, prod
+
+def _sieve_primes(limit):
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Первые 2048 простых: отсев кандидата одним gcd с их произведением
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = prod(SMALL_PRIMES)
+# Основания 2..41 дают точный ответ Миллера–Рабина для n < MR_DETERMINISTIC_LIMIT
+MR_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
 
 def is_prime(n, k=5):
-    """Проверка простоты числа (тест Миллера–Рабина)."""
+    """Проверка простоты числа (тест Миллера–Рабина с отсевом по малым простым)."""
     if n < 2:
         return False
-
-    small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
-    if n in small_primes:
-        return True
-    if any(n % p == 0 for p in small_primes):
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if gcd(n, _PRIMORIAL) != 1:
         return False
 
     s, d = 0, n - 1
     while d % 2 == 0:
         s += 1
         d //= 2
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
+    if n < MR_DETERMINISTIC_LIMIT:
+        bases = MR_DETERMINISTIC_BASES
+    else:
+        bases = [random.randrange(2, n - 1) for _ in range(k)]
+    for a in bases:
         x = pow(a, d, n)
         if x == 1 or x == n - 1:
             continue
@@ -36,6 +56,43 @@ def is_prime(n, k=5):
             return False
     return True
 
+# Для модулей до этой длины два встроенных pow быстрее интерпретируемого цикла Штрауса
+MULTI_POW_MIN_BITS = 256
+
+def multi_pow(pairs, p):
+    """
+    g1^e1 * g2^e2 * ... mod p за один проход с общей цепочкой возведений в квадрат
+    (трюк Шамира/Штрауса), показатели e >= 0.
+    """
+    if p.bit_length() <= MULTI_POW_MIN_BITS:
+        result = 1 % p
+        for g, e in pairs:
+            result = (result * pow(g, e, p)) % p
+        return result
+    pairs = [(g % p, e) for g, e in pairs if e]
+    if not pairs:
+        return 1 % p
+    bits = max(e.bit_length() for _, e in pairs)
+    w = 1 if bits <= 8 else 2 if bits <= 24 else 3 if bits <= 80 else 4 if bits <= 240 else 5
+    tables = []
+    for g, _ in pairs:
+        table = [1, g]
+        for _ in range((1 << w) - 2):
+            table.append((table[-1] * g) % p)
+        tables.append(table)
+    mask = (1 << w) - 1
+    result = 1
+    for i in range((bits + w - 1) // w - 1, -1, -1):
+        if result != 1:
+            for _ in range(w):
+                result = (result * result) % p
+        shift = i * w
+        for (_, e), table in zip(pairs, tables):
+            d = (e >> shift) & mask
+            if d:
+                result = (result * table[d]) % p
+    return result % p
+
 def gen_prime(bits):
     """Генерирует простое число заданной битовой длины."""
     while True:
@@ -79,6 +136,8 @@ def generate_keys(p, q, g):
 def sign_file(filename, p, q, g, x):
     """Формирует подпись файла (r, s)."""
     H = sha256_of_file(filename)
+    # одна степень g^k на подпись: таблица фиксированного основания окупается
+    # только примерно с 40 возведений на одно g (при любой длине p), поэтому pow
     while True:
         k = random.randint(1, q - 1)
         r = pow(g, k, p) % q
@@ -118,7 +177,7 @@ def verify_file(filename, p, q, g, y):
         return
     u1 = (H * w) % q
     u2 = (r * w) % q
-    v = ((pow(g, u1, p) * pow(y, u2, p)) % p) % q
+    v = multi_pow([(g, u1), (y, u2)], p) % q
 
     if v == r:
         print("Подпись ВЕРНА — файл не изменён.\n")
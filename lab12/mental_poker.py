@@ -32,11 +32,10 @@ def generate_crypto_params():
 
 def mod_inverse(a, m):
     """Поиск обратного числа (a^-1 mod m)"""
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return 1
+    try:
+        return pow(a % m, -1, m)
+    except ValueError:
+        return 1
 
 def encrypt_card(card, key):
     """Шифрование карты с динамическими параметрами"""
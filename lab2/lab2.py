@@ -2,12 +2,43 @@
 Функции:
 - mod_pow(a, x, p): быстрое возведение в степень по модулю, возвращает a^x mod p.
   Поддерживает отрицательные x (через модульную обратную при существовании).
+  Использует метод скользящего окна, ширина окна выбирается по длине показателя.
 - mod_inv(a, p): модульная обратная числа a по модулю p (возвращает x: a*x ≡ 1 (mod p)),
   либо возбуждает ValueError, если обратной не существует.
-- is_probable_prime(n, k=5): вероятностный тест простоты (Miller–Rabin).
+- mod_inv_batch(values, p): обратные элементы для списка values одной инверсией.
+- is_probable_prime(n, k=None): тест простоты Миллера–Рабина с отсевом по малым простым
+  (один gcd), детерминированными основаниями для n < 3.3·10^24 и числом раундов по длине n.
 - is_probable_prime_fermat(n, k=5): тест простоты Ферма с высокой вероятностью.
+- generate_prime_between(low, high): простое из диапазона поиском по просеянным окнам,
+  iter_primes_between(low, high): поток последовательных простых из диапазона.
+- baby_step_giant_step(a, y, p, table="dict", memory_budget=None): дискретный логарифм;
+  таблица шагов младенца — dict или компактный отсортированный массив CompactBabySteps,
+  memory_budget ограничивает её размер ценой большего числа шагов великана.
+- pollard_rho_log(a, y, p, order=None, workers=1): дискретный логарифм ρ-методом Полларда
+  с памятью O(1) на блуждающего; различимые точки собираются в общую таблицу,
+  блуждающие запускаются в пуле из workers процессов.
+- discrete_log_many(a, ys, p): логарифмы для набора целей с одной таблицей шагов младенца
+  размером ~sqrt(T*p) и чередованием шагов великана по целям.
+- baby_step_giant_step_resumable(a, y, p, checkpoint=None, time_budget=None, step_budget=None,
+  progress=None): BSGS с ограничением времени/шагов, отчётами о скорости и ETA и
+  возобновлением с номера шага великана, сохранённого в JSON-файле.
+- CompactBabySteps(a, p, m).save(path) и MappedBabySteps(path): таблица шагов младенца
+  строится один раз, сохраняется в двоичный файл и открывается через mmap без копирования;
+  готовая таблица передаётся в baby_step_giant_step(a, y, p, table=...).
+- kangaroo_log(a, y, p, lo, hi, workers=1): λ-метод Полларда (кенгуру) для x из [lo, hi]
+  за O(sqrt(hi - lo)) шагов с памятью O(1) на кенгуру, стада прыгают в пуле процессов.
+- factorize(n), prime_factors(n): разложение пробным делением, ρ-методом Полларда — Брента
+  и методом эллиптических кривых (копия из Лаб.3), с кешем недавних разложений.
+- discrete_log(a, y, p): разложение p - 1 (prime_factors) и метод Полига — Хеллмана
+  (pohlig_hellman) с BSGS/ρ в подгруппах простого порядка; если p - 1 не удаётся
+  разложить, используется обычный BSGS.
+- index_calculus_log(a, y, p, bound=None, workers=1): исчисление индексов — параллельный
+  сбор соотношений по базе множителей, разреженное исключение по модулю крупных простых
+  делителей p - 1 (малые — Полиг — Хеллман) и спуск для y.
+- benchmark_discrete_log(bit_sizes): время BSGS, ρ-метода и исчисления индексов по длине p.
+- benchmark_bsgs_tables(m): байт на запись и скорость построения/поиска обеих таблиц.
 - Добавлена функция обобщённого алгоритма Евклида для нахождения НОД(a, b) и
-коэффициентов x, y из уравнения a*x + b*y = НОД(a, b).
+коэффициентов x, y из уравнения a*x + b*y = НОД(a, b) (итеративно, с ускорением Лемера).
 
 Меню:
 1) Возведение в степень по модулю
@@ -18,14 +49,78 @@
 0) Выход
 """
 
+import bisect
+from functools import lru_cache
+import heapq
+import json
+import os
+import queue
 import random
-from typing import Tuple, Optional, Dict
+import time
+import tracemalloc
+from array import array
+from typing import Callable, Tuple, Optional, Dict, Iterable, List, Iterator
 import math
+import mmap
+import struct
+import sys
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него компактная таблица ищется через bisect
+    np = None
 
 # -------------------------
 # Core algorithms
 # -------------------------
 
+def _window_size(bits: int) -> int:
+    """
+    Ширина окна k для показателя длиной bits бит.
+    Минимизирует число умножений: 2^(k-1) предвычислений + bits/(k+1) умножений окна.
+    """
+    best_k, best_cost = 1, bits
+    for k in range(2, 9):
+        cost = (1 << (k - 1)) + bits / (k + 1)
+        if cost < best_cost:
+            best_k, best_cost = k, cost
+    return best_k
+
+def _sliding_window_pow(base: int, exp: int, p: int) -> int:
+    """Возведение base^exp mod p методом скользящего окна (exp >= 0, 0 <= base < p)."""
+    if exp == 0:
+        return 1 % p
+    bits = bin(exp)[2:]
+    k = _window_size(len(bits))
+    # Нечётные степени: base^1, base^3, ..., base^(2^k - 1)
+    table = [base]
+    if k > 1:
+        sq = (base * base) % p
+        for _ in range((1 << (k - 1)) - 1):
+            table.append((table[-1] * sq) % p)
+    result = None
+    i = 0
+    n = len(bits)
+    while i < n:
+        if bits[i] == "0":
+            result = (result * result) % p
+            i += 1
+            continue
+        # окно bits[i:j] длиной не более k, заканчивающееся единицей
+        j = min(i + k, n)
+        while bits[j - 1] == "0":
+            j -= 1
+        window = int(bits[i:j], 2)
+        if result is None:
+            result = table[window >> 1]
+        else:
+            for _ in range(j - i):
+                result = (result * result) % p
+            result = (result * table[window >> 1]) % p
+        i = j
+    return result
+
 def mod_pow(a: int, x: int, p: int) -> int:
     if p <= 0:
         raise ValueError("Модуль p должен быть положительным целым числом.")
@@ -36,23 +131,66 @@ def mod_pow(a: int, x: int, p: int) -> int:
         inv = mod_inv(a, p)
         x = -x
         a = inv
-    result = 1 % p
-    base = a % p
-    exp = x
-    while exp > 0:
-        if exp & 1:
-            result = (result * base) % p
-        base = (base * base) % p
-        exp >>= 1
-    return result
+    return _sliding_window_pow(a, x, p)
+
+_LEHMER_DIGIT_BITS = 62
+
+def _lehmer_extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
+    """
+    Расширенный алгоритм Евклида с ускорением Лемера для a >= b >= 0.
+    Пока числа длинные, последовательность частных моделируется на старших
+    62 битах машинными (малыми) числами, а к длинным числам применяется
+    накопленная матрица 2x2 — одно длинное умножение вместо многих делений.
+    """
+    u0, u1 = 1, 0
+    v0, v1 = 0, 1
+    while b.bit_length() > _LEHMER_DIGIT_BITS:
+        shift = a.bit_length() - _LEHMER_DIGIT_BITS
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C != 0 and bh + D != 0:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            u0, u1 = u1, u0 - q * u1
+            v0, v1 = v1, v0 - q * v1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            u0, u1 = A * u0 + B * u1, C * u0 + D * u1
+            v0, v1 = A * v0 + B * v1, C * v0 + D * v1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        u0, u1 = u1, u0 - q * u1
+        v0, v1 = v1, v0 - q * v1
+    return (a, u0, v0)
 
 def extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
-    if b == 0:
-        return (abs(a), 1 if a >= 0 else -1, 0)
-    g, x1, y1 = extended_gcd(b, a % b)
-    x = y1
-    y = x1 - (a // b) * y1
-    return (g, x, y)
+    """
+    Обобщённый алгоритм Евклида без рекурсии: возвращает (g, x, y), a*x + b*y = g.
+    Для неотрицательных a, b используется ускорение Лемера.
+    """
+    if a >= 0 and b >= 0:
+        if a >= b:
+            return _lehmer_extended_gcd(a, b)
+        g, x, y = _lehmer_extended_gcd(b, a)
+        return (g, y, x)
+    x0, x1 = 1, 0
+    y0, y1 = 0, 1
+    while b != 0:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        return (-a, -x0, -y0)
+    return (a, x0, y0)
 
 def mod_inv(a: int, p: int) -> int:
     if p <= 0:
@@ -63,34 +201,118 @@ def mod_inv(a: int, p: int) -> int:
         raise ValueError(f"Обратной не существует, gcd({a},{p}) = {g} ≠ 1.")
     return x % p
 
-def is_probable_prime(n: int, k: int = 5) -> bool:
-    """Вероятностный тест Миллера–Рабина"""
+def mod_inv_batch(values: List[int], p: int) -> List[int]:
+    """
+    Обратные элементы для всех values по модулю p (трюк Монтгомери):
+    одна модульная инверсия и 3(N-1) умножений вместо N инверсий.
+    Возбуждает ValueError, если хотя бы один элемент необратим.
+    """
+    if p <= 0:
+        raise ValueError("Модуль p должен быть положительным целым числом.")
+    values = [v % p for v in values]
+    if not values:
+        return []
+    prefix = []
+    acc = 1 % p
+    for v in values:
+        acc = (acc * v) % p
+        prefix.append(acc)
+    try:
+        inv = mod_inv(acc, p)
+    except ValueError:
+        for v in values:
+            g = math.gcd(v, p)
+            if g != 1:
+                raise ValueError(f"Обратной не существует, gcd({v},{p}) = {g} ≠ 1.")
+        raise
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = (inv * prefix[i - 1]) % p
+        inv = (inv * values[i]) % p
+    result[0] = inv
+    return result
+
+def _sieve_primes(limit: int) -> List[int]:
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Первые 2048 простых (до 17863) и их произведение для отсева одним gcd
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# Доказанные детерминированные наборы оснований Миллера–Рабина: (граница n, основания)
+_MR_DETERMINISTIC_BASES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+def _mr_rounds_for_bits(bits: int) -> int:
+    """Число раундов со случайными основаниями для случайного кандидата (ошибка < 2^-128)."""
+    if bits >= 3747:
+        return 3
+    if bits >= 1345:
+        return 4
+    if bits >= 476:
+        return 5
+    if bits >= 400:
+        return 6
+    if bits >= 347:
+        return 7
+    if bits >= 308:
+        return 8
+    return 27
+
+def _miller_rabin_round(n: int, d: int, s: int, a: int) -> bool:
+    """Один раунд Миллера–Рабина по основанию a (n - 1 = d * 2^s). True — n прошло раунд."""
+    x = mod_pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = (x * x) % n
+        if x == n - 1:
+            return True
+    return False
+
+def is_probable_prime(n: int, k: int = None) -> bool:
+    """
+    Тест простоты Миллера–Рабина с предварительным отсевом.
+    1) Делимость на первые 2048 простых проверяется одним gcd с их произведением.
+    2) Для n < 3.3·10^24 используются доказанные детерминированные наборы оснований
+       (результат точный, k не используется).
+    3) Для больших n выполняется k раундов со случайными основаниями; если k не задано,
+       число раундов выбирается по битовой длине n.
+    """
     if n < 2:
         return False
-    small_primes = [2,3,5,7,11,13,17,19,23,29]
-    for p in small_primes:
-        if n == p:
-            return True
-        if n % p == 0:
-            return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if math.gcd(n, _PRIMORIAL) != 1:
+        return False
     # write n-1 as d * 2^s
     d = n - 1
-    s = 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    for _ in range(k):
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for bound, bases in _MR_DETERMINISTIC_BASES:
+        if n < bound:
+            return all(_miller_rabin_round(n, d, s, a) for a in bases)
+    rounds = k if k is not None else _mr_rounds_for_bits(n.bit_length())
+    for _ in range(rounds):
         a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        composite = True
-        for _ in range(s - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                composite = False
-                break
-        if composite:
+        if not _miller_rabin_round(n, d, s, a):
             return False
     return True
 
@@ -134,15 +356,194 @@ def generalized_euclid(a: int = None, b: int = None, prime_only=False) -> Tuple[
 # Лабораторная 2 Новая функция: Baby-step Giant-step
 # -------------------------
 
-def baby_step_giant_step(a: int, y: int, p: int) -> Optional[int]:
+# Байт на запись таблицы шагов младенца (оценка для memory_budget):
+# dict — ключ и значение int плюс слот хеш-таблицы; compact — одна упакованная запись uint64.
+# Для dict замер tracemalloc после _build_dict_baby_steps (64-битный p, CPython 3.11,
+# m от 2^14 до 2^20 с шагом 2^(1/4)): резидентно 98-125 байт на запись в зависимости
+# от заполнения хеш-таблицы (108 при m = 2^k), на пике роста dict до ~149. Берётся
+# верхняя граница резидентного размера, чтобы таблица не превышала memory_budget.
+DICT_BYTES_PER_ENTRY = 125
+COMPACT_BYTES_PER_ENTRY = 8
+
+BSGS_FILE_MAGIC = b"BSGSTAB1"
+
+_HASH_MULT = 0x9E3779B97F4A7C15
+_LOW32 = 0xFFFFFFFF
+
+def _residue_hash(r: int) -> int:
+    """32-битный хеш вычета (мультипликативное хеширование по 64-битной маске)."""
+    return ((r * _HASH_MULT) & 0xFFFFFFFFFFFFFFFF) >> 32
+
+class CompactBabySteps:
+    """
+    Компактная таблица шагов младенца a^j mod p, j = 0..m-1.
+
+    Каждая запись — одно число uint64: (32-битный хеш вычета << 32) | j, записи
+    отсортированы. Резидентно 8 байт на запись (против 98-125 байт у dict int→int,
+    см. DICT_BYTES_PER_ENTRY), пик при построении ~16 байт на запись с NumPy
+    и ~28 без него (сортировка блоками).
+    Поиск — двоичный (bisect) по массиву array('Q'); при наличии NumPy таблица
+    хранится в ndarray и поиск выполняется блоками через np.searchsorted.
+    Замер benchmark_bsgs_tables (m = 2^18, 64-битный p): построение ~55-80 тыс. шагов/с
+    против ~150-175 тыс. у dict; поиск ~0.3 млн шагов великана/с (bisect) и ~1.8 млн/с
+    (NumPy) против ~3.3 млн/с у dict. Компактная таблица выгодна, когда dict не помещается в память.
+    Хеш может совпасть у разных вычетов, поэтому найденный j — только кандидат,
+    решение проверяется возведением в степень.
+    """
+
+    def __init__(self, a: int, p: int, m: int, block: int = 1 << 16):
+        if m > 1 << 32:
+            raise ValueError("Компактная таблица поддерживает не более 2^32 шагов младенца.")
+        self.a = a % p
+        self.p = p
+        self.m = m
+        entries = array("Q")
+        aj = 1
+        for j in range(m):
+            entries.append((_residue_hash(aj) << 32) | j)
+            aj = (aj * self.a) % p
+        if np is not None:
+            self.entries = np.sort(np.frombuffer(entries, dtype=np.uint64))
+        else:
+            # сортировка блоками и слияние: временные списки Python не больше block записей
+            chunks = [array("Q", sorted(entries[i:i + block])) for i in range(0, m, block)]
+            del entries
+            self.entries = array("Q", heapq.merge(*chunks)) if len(chunks) > 1 else (chunks[0] if chunks else array("Q"))
+
+    def candidates(self, residue: int) -> Iterator[int]:
+        """Показатели j (по возрастанию), у которых хеш a^j совпадает с хешем residue."""
+        h = _residue_hash(residue)
+        entries = self.entries
+        i = bisect.bisect_left(entries, h << 32)
+        while i < len(entries) and int(entries[i]) >> 32 == h:
+            yield int(entries[i]) & _LOW32
+            i += 1
+
+    def lookup_block(self, residues: List[int]) -> Iterator[Tuple[int, int]]:
+        """
+        Пары (t, j) для блока вычетов residues: хеш a^j совпадает с хешем residues[t].
+        Пары выдаются по возрастанию t, при равном t — по возрастанию j.
+        """
+        if np is None or not residues:
+            for t, r in enumerate(residues):
+                for j in self.candidates(r):
+                    yield t, j
+            return
+        entries = self.entries
+        hashes = np.fromiter((_residue_hash(r) for r in residues), dtype=np.uint64, count=len(residues))
+        keys = hashes << np.uint64(32)
+        idx = np.searchsorted(entries, keys)
+        found = np.minimum(idx, len(entries) - 1)
+        hits = np.flatnonzero((idx < len(entries)) & ((entries[found] >> np.uint64(32)) == hashes))
+        for t in hits:
+            i = int(idx[t])
+            h = int(hashes[t])
+            while i < len(entries) and int(entries[i]) >> 32 == h:
+                yield int(t), int(entries[i]) & _LOW32
+                i += 1
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет таблицу в двоичный файл для MappedBabySteps (little-endian):
+        сигнатура BSGS_FILE_MAGIC, m (uint64), длина p в байтах L (uint32) и 4 нулевых байта,
+        p и a по L байт, выравнивание нулями до 8 байт, затем m записей uint64.
+        """
+        plen = (self.p.bit_length() + 7) // 8
+        header = BSGS_FILE_MAGIC + struct.pack("<QII", self.m, plen, 0)
+        header += self.p.to_bytes(plen, "little") + self.a.to_bytes(plen, "little")
+        header += bytes(-len(header) % 8)
+        entries = array("Q", self.entries.tobytes()) if np is not None else array("Q", self.entries)
+        if sys.byteorder == "big":
+            entries.byteswap()
+        with open(path, "wb") as f:
+            f.write(header)
+            entries.tofile(f)
+
+class MappedBabySteps(CompactBabySteps):
+    """
+    Таблица шагов младенца, открытая из файла CompactBabySteps.save через mmap (только чтение).
+    Записи не копируются в память процесса: поиск идёт прямо по отображённым страницам
+    (memoryview.cast('Q') + bisect либо np.frombuffer без копирования), поэтому открытие
+    файла не требует повторного построения таблицы, а запрос стоит только шагов великана.
+    Объект можно использовать как контекстный менеджер; close() освобождает отображение.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if mm[:8] != BSGS_FILE_MAGIC:
+            mm.close()
+            raise ValueError(f"Файл {path} не является таблицей шагов младенца.")
+        self.m, plen, _ = struct.unpack_from("<QII", mm, 8)
+        offset = 24
+        self.p = int.from_bytes(mm[offset:offset + plen], "little")
+        self.a = int.from_bytes(mm[offset + plen:offset + 2 * plen], "little")
+        offset += 2 * plen
+        offset += -offset % 8
+        if len(mm) != offset + 8 * self.m:
+            mm.close()
+            raise ValueError(f"Файл {path} повреждён: ожидалось {self.m} записей.")
+        if np is not None:
+            self.entries = np.frombuffer(mm, dtype="<u8", count=self.m, offset=offset)
+        elif sys.byteorder == "little":
+            self._view = memoryview(mm)[offset:].cast("Q")
+            self.entries = self._view
+        else:
+            self.entries = array("Q", mm[offset:])
+            self.entries.byteswap()
+
+    def close(self) -> None:
+        self.entries = None
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _build_dict_baby_steps(a: int, p: int, m: int) -> Dict[int,int]:
+    baby_steps: Dict[int,int] = {}
+    aj = 1
+    for j in range(m):
+        if aj not in baby_steps:
+            baby_steps[aj] = j
+        aj = (aj * a) % p
+    return baby_steps
+
+def _baby_step_count(n: int, bytes_per_entry: int, memory_budget: Optional[int]) -> int:
+    """m = ceil(sqrt(n)), уменьшенное так, чтобы таблица уложилась в memory_budget байт."""
+    m = math.isqrt(n - 1) + 1
+    if memory_budget is not None:
+        m = max(1, min(m, memory_budget // bytes_per_entry))
+    return m
+
+def baby_step_giant_step(a: int, y: int, p: int, table: str = "dict", memory_budget: Optional[int] = None,
+                         order: Optional[int] = None) -> Optional[int]:
     """
     Решает y ≡ a^x (mod p) для x методом 'шаг младенца — шаг великана'.
     Возвращает x >= 0, либо None, если решения нет (в рамках проверок).
     Требование: p > 1, целые a,y.
     Замечание: реализация предполагает, что a и p взаимно просты (gcd(a,p)=1).
+
+    table — вид таблицы шагов младенца:
+      "dict"    — словарь вычет → j, ~DICT_BYTES_PER_ENTRY байт на запись, поиск O(1);
+      "compact" — CompactBabySteps, COMPACT_BYTES_PER_ENTRY байт на запись, поиск O(log m);
+      готовый объект CompactBabySteps (в т.ч. MappedBabySteps из файла) — таблица не строится,
+      m берётся из неё, memory_budget не используется.
+    memory_budget — ограничение памяти под таблицу в байтах: число шагов младенца m
+    уменьшается до memory_budget / (байт на запись), число шагов великана растёт до ceil(p/m).
+    order — известная верхняя граница порядка a (например, порядок подгруппы): поиск
+    ведётся по x из [0, order) с m = ceil(sqrt(order)) вместо ceil(sqrt(p)).
     """
     if p <= 1:
         raise ValueError("Модуль p должен быть > 1.")
+    if not isinstance(table, CompactBabySteps) and table not in ("dict", "compact"):
+        raise ValueError(f"Неизвестный вид таблицы: {table!r} (ожидается 'dict' или 'compact').")
     a %= p
     y %= p
     if y == 1:
@@ -151,14 +552,15 @@ def baby_step_giant_step(a: int, y: int, p: int) -> Optional[int]:
     g = math.gcd(a, p)
     if g != 1:
         raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
-    m = int(math.ceil(math.sqrt(p)))
-    # Предвычисление "младших шагов": a^j for j in [0..m-1]
-    baby_steps: Dict[int,int] = {}
-    aj = 1
-    for j in range(m):
-        if aj not in baby_steps:
-            baby_steps[aj] = j
-        aj = (aj * a) % p
+    n = order or p
+    if isinstance(table, CompactBabySteps):
+        if table.a != a or table.p != p:
+            raise ValueError("Готовая таблица шагов младенца построена для других a и p.")
+        m = table.m
+    else:
+        bytes_per_entry = DICT_BYTES_PER_ENTRY if table == "dict" else COMPACT_BYTES_PER_ENTRY
+        m = _baby_step_count(n, bytes_per_entry, memory_budget)
+    giant_steps = -(-n // m) + 1
 
     a_m = mod_pow(a, m, p)
     try:
@@ -166,9 +568,27 @@ def baby_step_giant_step(a: int, y: int, p: int) -> Optional[int]:
     except ValueError:
         raise ValueError("Не удалось найти обратный элемент для a^m (необратим модуль p).")
 
+    if table != "dict":
+        baby = table if isinstance(table, CompactBabySteps) else CompactBabySteps(a, p, m)
+        gamma = y
+        block = 4096
+        for start in range(0, giant_steps, block):
+            gammas = []
+            for _ in range(min(block, giant_steps - start)):
+                gammas.append(gamma)
+                gamma = (gamma * a_m_inv) % p
+            for t, j in baby.lookup_block(gammas):
+                x = (start + t) * m + j
+                if mod_pow(a, x, p) == y:
+                    return x
+        return None
+
+    # Предвычисление "младших шагов": a^j for j in [0..m-1]
+    baby_steps = _build_dict_baby_steps(a, p, m)
+
     gamma = y
-    # "Великие шаги": искать i от 0..m-1
-    for i in range(m + 1):
+    # "Великие шаги": искать i от 0..giant_steps-1
+    for i in range(giant_steps):
         if gamma in baby_steps:
             j = baby_steps[gamma]
             x = i * m + j
@@ -177,14 +597,1054 @@ def baby_step_giant_step(a: int, y: int, p: int) -> Optional[int]:
         gamma = (gamma * a_m_inv) % p
     return None
 
-def generate_prime_between(low: int, high: int) -> int:
-    """Генерирует вероятное простое между low и high (включительно)."""
+def discrete_log_many(a: int, ys: List[int], p: int, table: str = "dict",
+                      memory_budget: Optional[int] = None, order: Optional[int] = None) -> List[Optional[int]]:
+    """
+    Решает y ≡ a^x (mod p) для всех y из ys с одной общей таблицей шагов младенца.
+    Для T целей таблица берётся размером m ≈ sqrt(T*p) (в пределах memory_budget),
+    шаги великана для всех нерешённых целей чередуются: на i-м шаге проверяются
+    y_t * a^(-i*m) всех целей. Стоимость — m построений плюс T*p/m шагов великана
+    вместо T*2*sqrt(p) у BSGS в цикле. Параметры table и order — как у baby_step_giant_step.
+    Возвращает список x (наименьших) в порядке ys; None — решение не найдено.
+    """
+    if p <= 1:
+        raise ValueError("Модуль p должен быть > 1.")
+    if not isinstance(table, CompactBabySteps) and table not in ("dict", "compact"):
+        raise ValueError(f"Неизвестный вид таблицы: {table!r} (ожидается 'dict' или 'compact').")
+    a %= p
+    g = math.gcd(a, p)
+    if g != 1:
+        raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
+    targets = [y % p for y in ys]
+    results: List[Optional[int]] = [0 if y == 1 else None for y in targets]
+    active = [t for t, y in enumerate(targets) if y != 1 and math.gcd(y, p) == 1]
+    if not active:
+        return results
+    n = order or p
+    if isinstance(table, CompactBabySteps):
+        if table.a != a or table.p != p:
+            raise ValueError("Готовая таблица шагов младенца построена для других a и p.")
+        m = table.m
+    else:
+        bytes_per_entry = DICT_BYTES_PER_ENTRY if table == "dict" else COMPACT_BYTES_PER_ENTRY
+        m = min(n, _baby_step_count(len(active) * n, bytes_per_entry, memory_budget))
+    giant_steps = -(-n // m) + 1
+    a_m_inv = mod_inv(mod_pow(a, m, p), p)
+    if table == "dict":
+        baby_steps = _build_dict_baby_steps(a, p, m)
+    else:
+        baby = table if isinstance(table, CompactBabySteps) else CompactBabySteps(a, p, m)
+    gammas = {t: targets[t] for t in active}
+
+    for i in range(giant_steps):
+        if not gammas:
+            break
+        solved = []
+        if table == "dict":
+            for t, gamma in gammas.items():
+                j = baby_steps.get(gamma)
+                if j is not None and mod_pow(a, i * m + j, p) == targets[t]:
+                    solved.append((t, i * m + j))
+        else:
+            order_t = list(gammas)
+            for k, j in baby.lookup_block([gammas[t] for t in order_t]):
+                t = order_t[k]
+                if (not solved or solved[-1][0] != t) and mod_pow(a, i * m + j, p) == targets[t]:
+                    solved.append((t, i * m + j))
+        for t, x in solved:
+            results[t] = x
+            del gammas[t]
+        for t in gammas:
+            gammas[t] = (gammas[t] * a_m_inv) % p
+    return results
+
+def _save_checkpoint(path: str, state: Dict[str, int]) -> None:
+    """Атомарно записывает состояние поиска в JSON (через временный файл и os.replace)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def print_progress(info: Dict[str, float]) -> None:
+    """Обратный вызов прогресса по умолчанию: печатает долю, скорость и оценку времени."""
+    eta = info["eta"]
+    eta_str = f"{eta:.0f} с" if eta != float("inf") else "?"
+    print(f"  шаги великана: {info['done']}/{info['total']} ({100 * info['done'] / info['total']:.1f}%), "
+          f"{info['rate']:.0f} шаг/с, осталось ~{eta_str}")
+
+def baby_step_giant_step_resumable(a: int, y: int, p: int, checkpoint: Optional[str] = None,
+                                   time_budget: Optional[float] = None, step_budget: Optional[int] = None,
+                                   progress: Optional[Callable[[Dict[str, float]], None]] = None,
+                                   progress_interval: float = 1.0, table: str = "dict",
+                                   memory_budget: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """
+    BSGS с ограничением по времени/числу шагов, прогрессом и возобновлением.
+
+    time_budget — предел времени работы в секундах (вместе с построением таблицы),
+    step_budget — предел числа шагов великана за этот запуск. progress(info) вызывается
+    не чаще раза в progress_interval секунд с полями done, total, rate (шаг/с), eta (с).
+    checkpoint — путь к JSON-файлу с a, y, p, m и номером следующего шага великана:
+    файл обновляется вместе с прогрессом и при остановке, а при повторном вызове с тем же
+    файлом поиск продолжается с сохранённого шага (таблица шагов младенца строится заново,
+    либо передаётся готовой — CompactBabySteps/MappedBabySteps). По завершении файл удаляется.
+
+    Возвращает словарь: status — "found", "not_found" или "paused", x — решение или None,
+    giant_index — номер следующего шага великана, giant_steps — их общее число.
+    """
+    start_time = time.perf_counter()
+    if p <= 1:
+        raise ValueError("Модуль p должен быть > 1.")
+    if not isinstance(table, CompactBabySteps) and table not in ("dict", "compact"):
+        raise ValueError(f"Неизвестный вид таблицы: {table!r} (ожидается 'dict' или 'compact').")
+    a %= p
+    y %= p
+    g = math.gcd(a, p)
+    if g != 1:
+        raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
+    if isinstance(table, CompactBabySteps):
+        if table.a != a or table.p != p:
+            raise ValueError("Готовая таблица шагов младенца построена для других a и p.")
+        m = table.m
+    else:
+        bytes_per_entry = DICT_BYTES_PER_ENTRY if table == "dict" else COMPACT_BYTES_PER_ENTRY
+        m = _baby_step_count(p, bytes_per_entry, memory_budget)
+    first = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint, encoding="utf-8") as f:
+            state = json.load(f)
+        if (state["a"], state["y"], state["p"]) != (a, y, p):
+            raise ValueError(f"Контрольная точка {checkpoint} относится к другой задаче.")
+        if state["m"] != m:
+            raise ValueError(f"Контрольная точка {checkpoint} записана для m = {state['m']}, а не {m}.")
+        first = state["next"]
+    giant_steps = -(-p // m) + 1
+    result: Dict[str, Optional[int]] = {"status": "not_found", "x": None,
+                                        "giant_index": first, "giant_steps": giant_steps}
+
+    def finish(status, x, index):
+        result.update(status=status, x=x, giant_index=index)
+        if checkpoint is not None:
+            if status == "paused":
+                _save_checkpoint(checkpoint, {"a": a, "y": y, "p": p, "m": m, "next": index})
+            elif os.path.exists(checkpoint):
+                os.remove(checkpoint)
+        return result
+
+    if y == 1:
+        return finish("found", 0, 0)
+    a_m_inv = mod_inv(mod_pow(a, m, p), p)
+    if table == "dict":
+        baby_steps = _build_dict_baby_steps(a, p, m)
+    else:
+        baby = table if isinstance(table, CompactBabySteps) else CompactBabySteps(a, p, m)
+    gamma = (y * mod_pow(a_m_inv, first, p)) % p
+
+    block = 4096
+    run_start = time.perf_counter()
+    last_report = run_start
+    i = first
+    while i < giant_steps:
+        if step_budget is not None and i - first >= step_budget:
+            return finish("paused", None, i)
+        if time_budget is not None and time.perf_counter() - start_time >= time_budget:
+            return finish("paused", None, i)
+        count = min(block, giant_steps - i)
+        if step_budget is not None:
+            count = min(count, first + step_budget - i)
+        gammas = []
+        for _ in range(count):
+            gammas.append(gamma)
+            gamma = (gamma * a_m_inv) % p
+        if table == "dict":
+            hits = ((t, baby_steps[gm]) for t, gm in enumerate(gammas) if gm in baby_steps)
+        else:
+            hits = baby.lookup_block(gammas)
+        for t, j in hits:
+            x = (i + t) * m + j
+            if mod_pow(a, x, p) == y:
+                return finish("found", x, i + t)
+        i += count
+        now = time.perf_counter()
+        if now - last_report >= progress_interval:
+            last_report = now
+            if checkpoint is not None:
+                _save_checkpoint(checkpoint, {"a": a, "y": y, "p": p, "m": m, "next": i})
+            if progress is not None:
+                rate = (i - first) / (now - run_start)
+                progress({"done": i, "total": giant_steps, "rate": rate,
+                          "eta": (giant_steps - i) / rate if rate > 0 else float("inf")})
+    return finish("not_found", None, giant_steps)
+
+# Число множителей r-добавляющего блуждания Полларда
+_RHO_BRANCHES = 32
+
+def _rho_multipliers(a: int, y: int, p: int, n: int, seed: int) -> List[Tuple[int,int,int]]:
+    """Множители блуждания M_i = a^c_i * y^d_i mod p: список (M_i, c_i, d_i)."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(_RHO_BRANCHES):
+        c, d = rng.randrange(n), rng.randrange(n)
+        result.append(((mod_pow(a, c, p) * mod_pow(y, d, p)) % p, c, d))
+    return result
+
+def _rho_walk_task(a: int, y: int, p: int, n: int, multipliers: List[Tuple[int,int,int]],
+                   dist_bits: int, points: int, seed: int) -> Tuple[List[Tuple[int,int,int]], int]:
+    """
+    Один блуждающий по группе: x = a^u * y^v, на каждом шаге x умножается на M_(x mod r).
+    Возвращает до points различимых точек (x, u, v) — у x младшие dist_bits бит нулевые —
+    и число сделанных шагов. Блуждание без различимой точки за 20 * 2^dist_bits шагов
+    (зациклилось) начинается заново.
+    """
+    rng = random.Random(seed)
+    mask = (1 << dist_bits) - 1
+    max_walk = 20 << dist_bits
+    found = []
+    steps = 0
+    while len(found) < points:
+        u, v = rng.randrange(n), rng.randrange(n)
+        x = (mod_pow(a, u, p) * mod_pow(y, v, p)) % p
+        for _ in range(max_walk):
+            m, c, d = multipliers[x % _RHO_BRANCHES]
+            x = (x * m) % p
+            u += c
+            v += d
+            steps += 1
+            if x & mask == 0:
+                found.append((x, u % n, v % n))
+                break
+    return found, steps
+
+def _rho_solve_collision(a: int, y: int, p: int, n: int, u1: int, v1: int, u2: int, v2: int,
+                         max_candidates: int = 1 << 16) -> Optional[int]:
+    """
+    Из a^u1 y^v1 = a^u2 y^v2 следует x*(v1 - v2) ≡ u2 - u1 (mod n).
+    Перебирает gcd(v1 - v2, n) решений сравнения и возвращает наименьшее, для которого a^x ≡ y.
+    """
+    dv, du = (v1 - v2) % n, (u2 - u1) % n
+    g = math.gcd(dv, n)
+    if dv == 0 or du % g != 0 or g > max_candidates:
+        return None
+    step = n // g
+    x0 = (du // g) * mod_inv(dv // g, step) % step if step > 1 else 0
+    for k in range(g):
+        x = x0 + k * step
+        if mod_pow(a, x, p) == y:
+            return x
+    return None
+
+def pollard_rho_log(a: int, y: int, p: int, order: Optional[int] = None, workers: int = 1,
+                    dist_bits: Optional[int] = None, max_steps: Optional[int] = None) -> Optional[int]:
+    """
+    Решает y ≡ a^x (mod p) ρ-методом Полларда с различимыми точками (ван Оршот — Винер).
+    Каждый блуждающий хранит только текущую точку (память O(1)); в общую таблицу
+    попадают лишь различимые точки, и совпадение двух из них даёт сравнение на x.
+    При workers > 1 блуждающие работают в пуле процессов (в работе 2 * workers заданий),
+    при первом найденном решении пул завершается.
+
+    order — порядок a (по умолчанию p - 1; для a, не являющегося первообразным корнем,
+    следует передать его точный порядок). dist_bits — число нулевых младших бит
+    различимой точки (по умолчанию ~ log2(sqrt(order)) - 10, т.е. около тысячи точек в таблице).
+    max_steps — предел общего числа шагов (по умолчанию 64 * sqrt(order)); при его
+    исчерпании возвращается None (например, если y не лежит в подгруппе, порождённой a).
+    Возвращает x из [0, order) либо None.
+    """
+    if p <= 2:
+        raise ValueError("Модуль p должен быть > 2.")
+    a %= p
+    y %= p
+    g = math.gcd(a, p)
+    if g != 1:
+        raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
+    if y == 1:
+        return 0
+    if math.gcd(y, p) != 1:
+        return None
+    n = order or (p - 1)
+    if dist_bits is None:
+        dist_bits = max(0, n.bit_length() // 2 - 10)
+    if max_steps is None:
+        max_steps = 64 * (math.isqrt(n) + 1)
+    multipliers = _rho_multipliers(a, y, p, n, random.getrandbits(64))
+    points = 16
+    table: Dict[int, Tuple[int,int]] = {}
+    total_steps = 0
+
+    def absorb(found):
+        for x, u, v in found:
+            prev = table.setdefault(x, (u, v))
+            if prev != (u, v):
+                res = _rho_solve_collision(a, y, p, n, prev[0], prev[1], u, v)
+                if res is not None:
+                    return res
+        return None
+
+    base_seed = random.getrandbits(64)
+    if workers <= 1:
+        task_id = 0
+        while total_steps < max_steps:
+            found, steps = _rho_walk_task(a, y, p, n, multipliers, dist_bits, points, base_seed + task_id)
+            task_id += 1
+            total_steps += steps
+            res = absorb(found)
+            if res is not None:
+                return res
+        return None
+
+    results = queue.Queue()
+    with Pool(workers) as pool:
+        task_id = 0
+        def submit():
+            nonlocal task_id
+            pool.apply_async(_rho_walk_task, (a, y, p, n, multipliers, dist_bits, points, base_seed + task_id),
+                             callback=results.put, error_callback=results.put)
+            task_id += 1
+        for _ in range(2 * workers):
+            submit()
+        while total_steps < max_steps:
+            item = results.get()
+            if isinstance(item, BaseException):
+                raise item
+            found, steps = item
+            total_steps += steps
+            res = absorb(found)
+            if res is not None:
+                return res
+            submit()
+    return None
+
+def _kangaroo_jumps(a: int, p: int, width: int, herd: int) -> List[Tuple[int,int]]:
+    """
+    Прыжки кенгуру: длины 2^0..2^(k-1) со средним не меньше herd * sqrt(width) / 4
+    и соответствующие множители a^(2^i). Возвращает список (a^s_i mod p, s_i).
+    """
+    target = max(1, herd * math.isqrt(width) // 4)
+    k = 1
+    while ((1 << k) - 1) // k < target:
+        k += 1
+    return [(mod_pow(a, 1 << i, p), 1 << i) for i in range(k)]
+
+def _kangaroo_task(kid: int, p: int, jumps: List[Tuple[int,int]], dist_bits: int,
+                   x: int, d: int, points: int) -> Tuple[int, List[Tuple[int,int]], int, int, int]:
+    """
+    Прыжки одного кенгуру из точки x с пройденным расстоянием d: x умножается на a^s,
+    s выбирается по x mod k. Останавливается после points различимых точек (младшие
+    dist_bits бит x нулевые) либо 20 * 2^dist_bits шагов без таких точек.
+    Возвращает (kid, найденные точки [(x, d)], итоговые x, d, число шагов).
+    """
+    mask = (1 << dist_bits) - 1
+    k = len(jumps)
+    found = []
+    steps = 0
+    idle = 0
+    max_idle = 20 << dist_bits
+    while len(found) < points and idle < max_idle:
+        m, s = jumps[x % k]
+        x = (x * m) % p
+        d += s
+        steps += 1
+        idle += 1
+        if x & mask == 0:
+            found.append((x, d))
+            idle = 0
+    return kid, found, x, d, steps
+
+def kangaroo_log(a: int, y: int, p: int, lo: int, hi: int, workers: int = 1,
+                 dist_bits: Optional[int] = None, max_steps: Optional[int] = None) -> Optional[int]:
+    """
+    Решает y ≡ a^x (mod p) при известном x из [lo, hi] λ-методом Полларда (кенгуру)
+    с различимыми точками: O(sqrt(hi - lo)) шагов и O(1) памяти на кенгуру.
+    Ручные кенгуру стартуют из известных степеней a^(lo + w/2 + r), дикие — из y*a^r;
+    различимые точки собираются в общую таблицу, встреча ручного и дикого даёт x.
+    Встретившийся с собственным стадом кенгуру перезапускается из новой случайной точки.
+    При workers > 1 стадо из 2 * workers кенгуру прыгает в пуле процессов.
+    max_steps — предел общего числа прыжков (по умолчанию 64 * sqrt(hi - lo) + 1024);
+    при исчерпании (например, x вне интервала) возвращается None.
+    """
+    if p <= 2:
+        raise ValueError("Модуль p должен быть > 2.")
+    if lo > hi:
+        raise ValueError("Требуется lo <= hi.")
+    a %= p
+    y %= p
+    g = math.gcd(a, p)
+    if g != 1:
+        raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
+    width = hi - lo
+    # короткий интервал дешевле перебрать
+    if width < 1024:
+        x = mod_pow(a, lo, p)
+        for e in range(lo, hi + 1):
+            if x == y:
+                return e
+            x = (x * a) % p
+        return None
+    workers = max(1, workers)
+    herd = 2 * workers
+    jumps = _kangaroo_jumps(a, p, width, herd)
+    if dist_bits is None:
+        dist_bits = max(0, width.bit_length() // 2 - 8)
+    if max_steps is None:
+        max_steps = 64 * math.isqrt(width) + 1024
+    points = 8
+    mid = lo + width // 2
+
+    def start(kid):
+        r = random.randrange(width // 4 + 1)
+        if kid % 2 == 0:
+            return mod_pow(a, mid + r, p), mid + r
+        return (y * mod_pow(a, r, p)) % p, r
+
+    herd_state = {kid: start(kid) for kid in range(herd)}
+    table: Dict[int, Tuple[int,int]] = {}
+    total_steps = 0
+
+    def absorb(kid, found):
+        """Заносит различимые точки в таблицу; возвращает x, флаг перезапуска кенгуру."""
+        tame = kid % 2 == 0
+        for x, d in found:
+            prev = table.get(x)
+            if prev is None:
+                table[x] = (kid % 2, d)
+                continue
+            if prev[0] == kid % 2:
+                return None, True
+            e = d - prev[1] if tame else prev[1] - d
+            if lo <= e <= hi and mod_pow(a, e, p) == y:
+                return e, False
+        return None, False
+
+    def handle(item):
+        nonlocal total_steps
+        kid, found, x, d, steps = item
+        total_steps += steps
+        res, restart = absorb(kid, found)
+        herd_state[kid] = start(kid) if restart or not found else (x, d)
+        return res
+
+    if workers == 1:
+        while total_steps < max_steps:
+            for kid in range(herd):
+                x, d = herd_state[kid]
+                res = handle(_kangaroo_task(kid, p, jumps, dist_bits, x, d, points))
+                if res is not None:
+                    return res
+        return None
+
+    results = queue.Queue()
+    with Pool(workers) as pool:
+        def submit(kid):
+            x, d = herd_state[kid]
+            pool.apply_async(_kangaroo_task, (kid, p, jumps, dist_bits, x, d, points),
+                             callback=results.put, error_callback=results.put)
+        for kid in range(herd):
+            submit(kid)
+        while total_steps < max_steps:
+            item = results.get()
+            if isinstance(item, BaseException):
+                raise item
+            res = handle(item)
+            if res is not None:
+                return res
+            submit(item[0])
+    return None
+
+def _pollard_brent(n: int, c: int, max_iters: Optional[int] = None, batch: int = 128) -> Optional[int]:
+    """
+    ρ-метод Полларда в варианте Брента для составного нечётного n (x -> x^2 + c mod n).
+    Разности |x - y| накапливаются произведением, и gcd с n берётся раз в batch шагов;
+    если gcd оказался равен n, последний блок повторяется с gcd на каждом шаге.
+    Возвращает нетривиальный делитель либо None (неудачное c или исчерпан max_iters).
+    """
+    y, r, q, g = random.randrange(1, n), 1, 1, 1
+    iters = 0
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % n
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(batch, r - k)):
+                y = (y * y + c) % n
+                q = (q * abs(x - y)) % n
+            g = math.gcd(q, n)
+            k += batch
+        iters += r
+        r <<= 1
+        if max_iters is not None and iters >= max_iters and g == 1:
+            return None
+    if g == n:
+        while True:
+            ys = (ys * ys + c) % n
+            g = math.gcd(abs(x - ys), n)
+            if g > 1:
+                break
+    return g if g != n else None
+
+def _mont_ladder(k: int, x: int, z: int, a24: int, n: int) -> Tuple[int, int]:
+    """k * (x : z) на кривой Монтгомери B*y^2 = x^3 + A*x^2 + x над Z_n в координатах X:Z (a24 = (A+2)/4)."""
+    x1, z1 = x, z
+    t1, t2 = (x + z) ** 2 % n, (x - z) ** 2 % n
+    x2, z2 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+    for bit in bin(k)[3:]:
+        # (x1:z1) = m*P, (x2:z2) = (m+1)*P
+        u = (x1 - z1) * (x2 + z2) % n
+        v = (x1 + z1) * (x2 - z2) % n
+        xs, zs = z * (u + v) ** 2 % n, x * (u - v) ** 2 % n
+        if bit == "1":
+            t1, t2 = (x2 + z2) ** 2 % n, (x2 - z2) ** 2 % n
+            x1, z1 = xs, zs
+            x2, z2 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+        else:
+            t1, t2 = (x1 + z1) ** 2 % n, (x1 - z1) ** 2 % n
+            x2, z2 = xs, zs
+            x1, z1 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+    return x1, z1
+
+# Этапы ECM: (граница B1, число кривых); примерно оптимальны для делителей 15, 20, 25, 30 цифр
+_ECM_STAGES = ((2000, 25), (11000, 90), (50000, 300), (250000, 700))
+
+def _ecm(n: int) -> Optional[int]:
+    """
+    Метод эллиптических кривых Ленстры (первая стадия) на кривых Монтгомери с
+    параметризацией Суямы: точка умножается лестницей на все степени простых <= B1,
+    без обращений; gcd(Z, n) после умножения даёт делитель n, если порядок кривой
+    по модулю какого-то простого делителя B1-гладкий.
+    Возвращает нетривиальный делитель либо None, если этапы _ECM_STAGES исчерпаны.
+    """
+    for bound, curves in _ECM_STAGES:
+        prime_powers = []
+        for q in _sieve_primes(bound + 1):
+            qk = q
+            while qk * q <= bound:
+                qk *= q
+            prime_powers.append(qk)
+        for _ in range(curves):
+            sigma = random.randrange(6, n - 1)
+            u = (sigma * sigma - 5) % n
+            v = 4 * sigma % n
+            x, z = pow(u, 3, n), pow(v, 3, n)
+            den = 16 * pow(u, 3, n) * v % n
+            g = math.gcd(den, n)
+            if g != 1:
+                if g != n:
+                    return g
+                continue
+            a24 = pow(v - u, 3, n) * (3 * u + v) * pow(den, -1, n) % n
+            for qk in prime_powers:
+                x, z = _mont_ladder(qk, x, z, a24, n)
+            g = math.gcd(z, n)
+            if 1 < g < n:
+                return g
+    return None
+
+# Бюджет ρ-метода (итераций) перед переходом к ECM: делители до ~2^36 находятся ρ-методом
+_RHO_BUDGET = 1 << 18
+
+def _find_factor(n: int, ecm: bool = True) -> int:
+    """Нетривиальный делитель составного n: ρ-Брент с ограничением, затем ECM, затем ρ без ограничения."""
+    if n % 2 == 0:
+        return 2
+    r = math.isqrt(n)
+    if r * r == n:
+        return r
+    for c in (1, 3, 5, 7):
+        d = _pollard_brent(n, c, _RHO_BUDGET // 4)
+        if d:
+            return d
+    if ecm:
+        d = _ecm(n)
+        if d:
+            return d
+    c = 11
+    while True:
+        d = _pollard_brent(n, c)
+        if d:
+            return d
+        c += 2
+
+@lru_cache(maxsize=128)
+def factorize(n: int, ecm: bool = True) -> Tuple[Tuple[int, int], ...]:
+    """
+    Полное разложение n > 0: кортеж пар (простое, показатель) по возрастанию.
+    1) пробное деление на SMALL_PRIMES; 2) ρ-метод Полларда — Брента с пакетным gcd;
+    3) при ecm=True — метод эллиптических кривых для делителей, недоступных ρ-методу.
+    Простота множителей подтверждается тестом Миллера–Рабина. Недавние разложения
+    кешируются (lru_cache), так что повторные запросы для одного порядка группы бесплатны.
+    """
+    if n < 1:
+        raise ValueError("Разлагается только n >= 1.")
+    result: Dict[int, int] = {}
+    for q in SMALL_PRIMES:
+        if q * q > n:
+            break
+        while n % q == 0:
+            result[q] = result.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            result[m] = result.get(m, 0) + 1
+            continue
+        d = _find_factor(m, ecm)
+        stack.extend((d, m // d))
+    return tuple(sorted(result.items()))
+
+def prime_factors(n: int, limit: Optional[int] = None) -> List[int]:
+    """
+    Возвращает список простых множителей n (без повторений), см. factorize.
+    limit — только пробное деление до limit: если граница достигнута, остаток
+    добавляется последним элементом как есть и может оказаться составным.
+    """
+    if limit is None:
+        return [q for q, _ in factorize(n)]
+    factors = []
+    d = 2
+    temp = n
+    while d * d <= temp:
+        if d > limit:
+            break
+        if temp % d == 0:
+            factors.append(d)
+            while temp % d == 0:
+                temp //= d
+        d += 1 if d == 2 else 2
+    if temp > 1:
+        factors.append(temp)
+    return factors
+
+# Граница пробного деления p - 1 для Полига — Хеллмана, длина p, до которой p - 1
+# раскладывается полностью (factorize), и размер подгруппы, начиная с которого
+# подзадача решается ρ-методом вместо BSGS
+PH_TRIAL_LIMIT = 1 << 20
+PH_FULL_FACTOR_BITS = 128
+PH_RHO_MIN_BITS = 40
+
+def _subgroup_log(a: int, y: int, p: int, q: int, workers: int) -> Optional[int]:
+    """Логарифм y по основанию a порядка q (простого): BSGS для малых q, ρ-метод для больших."""
+    if q.bit_length() < PH_RHO_MIN_BITS:
+        return baby_step_giant_step(a, y, p, order=q)
+    return pollard_rho_log(a, y, p, order=q, workers=workers)
+
+def _element_order(a: int, p: int, factors: List[int]) -> int:
+    """Точный порядок a в Z_p* по простым делителям factors числа p - 1."""
+    order = p - 1
+    for q in factors:
+        while order % q == 0 and mod_pow(a, order // q, p) == 1:
+            order //= q
+    return order
+
+def _prime_power_log(a: int, y: int, p: int, order: int, q: int, workers: int = 1) -> Optional[Tuple[int, int]]:
+    """
+    x mod q^e, где q^e — наибольшая степень q, делящая order (порядок a): x восстанавливается
+    по одной q-ичной цифре через логарифм в подгруппе порядка q. Возвращает (x_q, q^e) либо None.
+    """
+    e = 0
+    while order % q ** (e + 1) == 0:
+        e += 1
+    qe = q ** e
+    if e == 0:
+        return 0, 1
+    a_q = mod_pow(a, order // qe, p)
+    y_q = mod_pow(y, order // qe, p)
+    gamma = mod_pow(a_q, q ** (e - 1), p)
+    a_q_inv = mod_inv(a_q, p)
+    x_q = 0
+    for k in range(e):
+        h = mod_pow((mod_pow(a_q_inv, x_q, p) * y_q) % p, q ** (e - 1 - k), p)
+        d = _subgroup_log(gamma, h, p, q, workers)
+        if d is None:
+            return None
+        x_q += d * q ** k
+    return x_q, qe
+
+def _crt_pair(x: int, modulus: int, r: int, m: int) -> Tuple[int, int]:
+    """КТО для взаимно простых модулей: x ≡ x (mod modulus), x ≡ r (mod m)."""
+    return x + modulus * ((r - x) * mod_inv(modulus, m) % m), modulus * m
+
+def pohlig_hellman(a: int, y: int, p: int, factors: List[int], workers: int = 1) -> Optional[int]:
+    """
+    Решает y ≡ a^x (mod p) методом Полига — Хеллмана по простым делителям factors числа p - 1.
+    Находится точный порядок a; для каждого q^e, делящего порядок, x mod q^e
+    восстанавливается по одной q-ичной цифре (логарифм в подгруппе порядка q),
+    после чего вычеты объединяются по КТО. Возвращает наименьший x >= 0 либо None.
+    """
+    a %= p
+    y %= p
+    order = _element_order(a, p, factors)
+    x, modulus = 0, 1
+    for q in factors:
+        part = _prime_power_log(a, y, p, order, q, workers)
+        if part is None:
+            return None
+        x, modulus = _crt_pair(x, modulus, *part)
+    return x if mod_pow(a, x, p) == y else None
+
+def _group_order_factors(p: int) -> List[int]:
+    """Простые делители p - 1 (последний элемент может быть составным, если p длиннее PH_FULL_FACTOR_BITS)."""
+    if p.bit_length() <= PH_FULL_FACTOR_BITS:
+        return prime_factors(p - 1)
+    return prime_factors(p - 1, PH_TRIAL_LIMIT)
+
+def discrete_log(a: int, y: int, p: int, workers: int = 1) -> Optional[int]:
+    """
+    Дискретный логарифм y ≡ a^x (mod p) для простого p.
+    p - 1 раскладывается полностью (factorize), если p не длиннее PH_FULL_FACTOR_BITS,
+    иначе — пробным делением до PH_TRIAL_LIMIT; если разложение полное (остаток простой),
+    задача решается методом Полига — Хеллмана за O(sum e*sqrt(q)), иначе — обычным BSGS.
+    """
+    if p <= 2:
+        return baby_step_giant_step(a, y, p)
+    g = math.gcd(a, p)
+    if g != 1:
+        raise ValueError(f"Требуется gcd(a, p) = 1. Сейчас gcd({a},{p}) = {g}.")
+    factors = _group_order_factors(p)
+    if not is_probable_prime(factors[-1]):
+        return baby_step_giant_step(a, y, p)
+    return pohlig_hellman(a, y, p, factors, workers)
+
+# Простые делители p - 1 меньше IC_MIN_PRIME (и входящие в p - 1 в степени выше первой)
+# обрабатываются методом Полига — Хеллмана, для остальных логарифмы базы множителей
+# находятся решением разреженной линейной системы по модулю q
+IC_MIN_PRIME = 1 << 20
+
+def _ic_factor_base_bound(p: int) -> int:
+    """
+    Граница базы множителей B = exp(0.6 * sqrt(ln p * ln ln p)), не меньше 200.
+    Множитель 0.6 (теоретический оптимум L_p[1/2, 1/2] даёт 0.5) подобран замером:
+    при 48-битном p B ≈ 650 быстрее, чем 220 и 2000.
+    """
+    lp = math.log(p)
+    return max(200, int(math.exp(0.6 * math.sqrt(lp * math.log(lp)))))
+
+def _ic_smooth_exponents(r: int, factor_base: List[int], fb_product: int) -> Optional[Dict[int, int]]:
+    """
+    Разложение r по базе множителей {индекс простого: показатель} либо None, если r не B-гладкое.
+    Гладкость проверяется одним возведением (r | P^(2^t), P — произведение базы, 2^t >= log2 r),
+    пробное деление выполняется только для гладких r.
+    """
+    if pow(fb_product, 1 << (r.bit_length() - 1).bit_length(), r) != 0:
+        return None
+    exps: Dict[int, int] = {}
+    for i, q in enumerate(factor_base):
+        if r % q == 0:
+            e = 0
+            while r % q == 0:
+                r //= q
+                e += 1
+            exps[i] = e
+            if r == 1:
+                break
+    return exps
+
+def _ic_search_task(a: int, start: int, p: int, factor_base: List[int], fb_product: int,
+                    seed: int, batch: int) -> Tuple[List[Tuple[int, Dict[int, int]]], int]:
+    """
+    Проверяет на гладкость start * a^k mod p для batch последовательных k от случайного k0
+    (из потока seed). Возвращает найденные соотношения [(k, показатели)] и batch.
+    """
+    rng = random.Random(seed)
+    k0 = rng.randrange(p - 1)
+    r = (start * mod_pow(a, k0, p)) % p
+    found = []
+    for k in range(k0, k0 + batch):
+        exps = _ic_smooth_exponents(r, factor_base, fb_product)
+        if exps is not None:
+            found.append((k, exps))
+        r = (r * a) % p
+    return found, batch
+
+def _ic_collect(a: int, start: int, p: int, factor_base: List[int], fb_product: int,
+                accept: Callable[[int, Dict[int, int]], bool], workers: int = 1,
+                batch: int = 2048) -> None:
+    """
+    Ищет гладкие start * a^k mod p, передавая каждое соотношение в accept(k, показатели),
+    пока accept не вернёт True. При workers > 1 поиск идёт в пуле процессов
+    (в работе 2 * workers заданий, по batch кандидатов в каждом).
+    """
+    base_seed = random.getrandbits(64)
+    if workers <= 1:
+        task_id = 0
+        while True:
+            found, _ = _ic_search_task(a, start, p, factor_base, fb_product, base_seed + task_id, batch)
+            task_id += 1
+            for k, exps in found:
+                if accept(k, exps):
+                    return
+    results = queue.Queue()
+    with Pool(workers) as pool:
+        task_id = 0
+        def submit():
+            nonlocal task_id
+            pool.apply_async(_ic_search_task, (a, start, p, factor_base, fb_product, base_seed + task_id, batch),
+                             callback=results.put, error_callback=results.put)
+            task_id += 1
+        for _ in range(2 * workers):
+            submit()
+        while True:
+            item = results.get()
+            if isinstance(item, BaseException):
+                raise item
+            for k, exps in item[0]:
+                if accept(k, exps):
+                    return
+            submit()
+
+def _solve_sparse_mod(rows: List[Dict[int, int]], rhs: List[int], ncols: int, q: int) -> List[Optional[int]]:
+    """
+    Разреженное исключение Гаусса по простому модулю q для системы sum(row[c] * x_c) = rhs.
+    Строки хранятся словарями {столбец: коэффициент}; столбцы исключаются от самых
+    редких (крупные простые базы) к самым плотным, ведущей берётся самая короткая строка,
+    чтобы уменьшить заполнение. Возвращает значения x_c; None — столбец не определяется системой.
+    """
+    rows = [{c: v % q for c, v in row.items() if v % q} for row in rows]
+    rhs = [b % q for b in rhs]
+    col_rows: Dict[int, set] = {c: set() for c in range(ncols)}
+    for i, row in enumerate(rows):
+        for c in row:
+            col_rows[c].add(i)
+    order = sorted(range(ncols), key=lambda c: len(col_rows[c]))
+    used = set()
+    pivots: List[Tuple[int, int]] = []
+    for c in order:
+        candidates = col_rows[c] - used
+        if not candidates:
+            continue
+        piv = min(candidates, key=lambda i: len(rows[i]))
+        used.add(piv)
+        prow = rows[piv]
+        inv = mod_inv(prow[c], q)
+        for col in prow:
+            prow[col] = (prow[col] * inv) % q
+        rhs[piv] = (rhs[piv] * inv) % q
+        pivots.append((c, piv))
+        for i in candidates:
+            if i == piv:
+                continue
+            row = rows[i]
+            f = row[c]
+            for col, v in prow.items():
+                nv = (row.get(col, 0) - f * v) % q
+                if nv:
+                    if col not in row:
+                        col_rows[col].add(i)
+                    row[col] = nv
+                elif col in row:
+                    del row[col]
+                    col_rows[col].discard(i)
+            rhs[i] = (rhs[i] - f * rhs[piv]) % q
+    x: List[Optional[int]] = [None] * ncols
+    for c, piv in reversed(pivots):
+        total = rhs[piv]
+        for col, v in rows[piv].items():
+            if col == c:
+                continue
+            if x[col] is None:
+                total = None
+                break
+            total -= v * x[col]
+        x[c] = total % q if total is not None else None
+    return x
+
+def index_calculus_log(a: int, y: int, p: int, bound: Optional[int] = None, workers: int = 1,
+                       extra: int = 20) -> Optional[int]:
+    """
+    Решает y ≡ a^x (mod p) методом исчисления индексов (p простое, a — первообразный корень).
+    1) База множителей — простые < bound (по умолчанию ≈ L_p[1/2, 1/2]); собираются
+       соотношения a^k ≡ prod(p_i^e_i) (mod p), дающие k ≡ sum(e_i * log p_i) (mod p - 1);
+       поиск гладких значений распараллелен на workers процессов.
+    2) Для каждого крупного простого q | p - 1 разреженная система решается по модулю q
+       (_solve_sparse_mod); малые простые множители p - 1 берутся методом Полига — Хеллмана.
+    3) Спуск: ищется гладкое y * a^s, тогда log y ≡ sum(e_i * log p_i) - s (mod q).
+    Вычеты объединяются по КТО. extra — число соотношений сверх размера базы
+    (и шаг, с которым они добираются, если система ещё не определяет все логарифмы).
+    Возбуждает ValueError, если p - 1 не раскладывается или a не первообразный корень.
+    """
+    if p <= 3:
+        raise ValueError("Модуль p должен быть простым > 3.")
+    a %= p
+    y %= p
+    if math.gcd(a, p) != 1 or math.gcd(y, p) != 1:
+        raise ValueError("Требуется gcd(a, p) = gcd(y, p) = 1.")
+    factors = _group_order_factors(p)
+    if not is_probable_prime(factors[-1]):
+        raise ValueError("Не удалось разложить p - 1.")
+    if _element_order(a, p, factors) != p - 1:
+        raise ValueError(f"{a} не является первообразным корнем по модулю {p}.")
+    if y == 1:
+        return 0
+    small = [q for q in factors if q < IC_MIN_PRIME or (p - 1) % (q * q) == 0]
+    large = [q for q in factors if q not in small]
+    x, modulus = 0, 1
+    for q in small:
+        part = _prime_power_log(a, y, p, p - 1, q, workers)
+        if part is None:
+            return None
+        x, modulus = _crt_pair(x, modulus, *part)
+    if large:
+        factor_base = _sieve_primes((bound or _ic_factor_base_bound(p)) + 1)
+        fb_product = math.prod(factor_base)
+        relations: List[Tuple[int, Dict[int, int]]] = []
+        seen = set()
+        needed = len(factor_base) + extra
+
+        def add_relation(k, exps):
+            if k % (p - 1) not in seen:
+                seen.add(k % (p - 1))
+                relations.append((k, exps))
+            return len(relations) >= needed
+
+        # Свободный (не определённый системой) столбец делает неизвестными все логарифмы,
+        # связанные с ним, поэтому соотношения добираются, пока не определятся все
+        # встретившиеся в них простые базы
+        while True:
+            _ic_collect(a, 1, p, factor_base, fb_product, add_relation, workers)
+            rows = [exps for _, exps in relations]
+            logs = {q: _solve_sparse_mod(rows, [k for k, _ in relations], len(factor_base), q) for q in large}
+            present = {i for row in rows for i in row}
+            if all(logs[q][i] is not None for q in large for i in present):
+                break
+            needed += max(extra, len(factor_base) // 5)
+        descent: List[Tuple[int, Dict[int, int]]] = []
+
+        def accept_descent(s, exps):
+            if all(logs[q][i] is not None for q in large for i in exps):
+                descent.append((s, exps))
+                return True
+            return False
+
+        _ic_collect(a, y, p, factor_base, fb_product, accept_descent, workers)
+        s, exps = descent[0]
+        for q in large:
+            x_q = (sum(e * logs[q][i] for i, e in exps.items()) - s) % q
+            x, modulus = _crt_pair(x, modulus, x_q, q)
+    return x if mod_pow(a, x, p) == y else None
+
+def benchmark_bsgs_tables(m: int = 1 << 18, bits: int = 64, lookups: int = 1 << 16) -> Dict[str, Dict[str, float]]:
+    """
+    Сравнивает таблицы шагов младенца "dict" и "compact" для m записей по модулю
+    длиной bits бит: байт на запись (tracemalloc, резидентно и на пике построения),
+    скорость построения (шагов младенца/с) и поиска (шагов великана/с).
+    """
+    p = generate_prime_between(1 << (bits - 1), 1 << bits)
+    a = random.randrange(2, p - 1)
+    gammas = [random.randrange(1, p) for _ in range(lookups)]
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"m = {m}, p: {bits} бит, NumPy: {'да' if np is not None else 'нет'}")
+    print(f"{'таблица':>8} | {'байт/запись':>11} | {'пик':>6} | {'построение':>16} | {'поиск':>16}")
+    for mode in ("dict", "compact"):
+        tracemalloc.start()
+        start = time.perf_counter()
+        baby = _build_dict_baby_steps(a, p, m) if mode == "dict" else CompactBabySteps(a, p, m)
+        build = time.perf_counter() - start
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        if mode == "dict":
+            hits = sum(1 for g in gammas if g in baby)
+        else:
+            hits = sum(1 for _ in baby.lookup_block(gammas))
+        lookup = time.perf_counter() - start
+        row = {"bytes_per_entry": size / m, "peak_bytes_per_entry": peak / m,
+               "baby_steps_per_sec": m / build, "giant_steps_per_sec": lookups / lookup, "hits": hits}
+        results[mode] = row
+        print(f"{mode:>8} | {row['bytes_per_entry']:>11.1f} | {row['peak_bytes_per_entry']:>6.1f} | "
+              f"{row['baby_steps_per_sec']:>12.0f} 1/с | {row['giant_steps_per_sec']:>12.0f} 1/с")
+        del baby
+    return results
+
+def benchmark_discrete_log(bit_sizes: Iterable[int] = (24, 32, 40, 48), workers: int = 1,
+                           bsgs_max_bits: int = 40, rho_max_bits: int = 48) -> Dict[int, Dict[str, float]]:
+    """
+    Сравнивает BSGS, ρ-метод и исчисление индексов на безопасных простых p = 2q + 1
+    (худший случай для Полига — Хеллмана) заданной битовой длины. Возвращает время (сек);
+    BSGS и ρ пропускаются для p длиннее bsgs_max_bits / rho_max_bits (память и время).
+    """
+    results: Dict[int, Dict[str, float]] = {}
+    print(f"{'бит':>4} | {'BSGS':>10} | {'rho':>10} | {'индексы':>10}")
+    for bits in bit_sizes:
+        while True:
+            q = generate_prime_between(1 << (bits - 2), 1 << (bits - 1))
+            if is_probable_prime(2 * q + 1):
+                p = 2 * q + 1
+                break
+        a = next(g for g in range(2, p) if mod_pow(g, 2, p) != 1 and mod_pow(g, q, p) != 1)
+        y = mod_pow(a, random.randrange(p - 1), p)
+        solvers = [("BSGS", lambda: baby_step_giant_step(a, y, p), bits <= bsgs_max_bits),
+                   ("rho", lambda: pollard_rho_log(a, y, p, workers=workers), bits <= rho_max_bits),
+                   ("index", lambda: index_calculus_log(a, y, p, workers=workers), True)]
+        row: Dict[str, float] = {}
+        for name, solve, enabled in solvers:
+            if not enabled:
+                continue
+            start = time.perf_counter()
+            x = solve()
+            row[name] = time.perf_counter() - start
+            if x is None or mod_pow(a, x, p) != y:
+                raise ValueError(f"{name}: неверный результат для p = {p}")
+        results[bits] = row
+        print(f"{bits:>4} | " + " | ".join(f"{row[name]:>8.2f} с" if name in row else f"{'—':>10}"
+                                          for name in ("BSGS", "rho", "index")))
+    return results
+
+def _sieve_window(start: int, length: int) -> bytearray:
+    """
+    Решето на окне [start, start + length): единица — число не делится ни на одно
+    из SMALL_PRIMES (сами малые простые не вычёркиваются).
+    """
+    alive = bytearray([1]) * length
+    for i in range(min(2, start), 2):
+        if i - start < length:
+            alive[i - start] = 0
+    for q in SMALL_PRIMES:
+        off = (-start) % q
+        if start + off <= q:
+            off = 2 * q - start
+        if off < length:
+            alive[off::q] = bytes(len(range(off, length, q)))
+    return alive
+
+def iter_primes_between(low: int, high: int, window: int = None) -> Iterator[int]:
+    """
+    Последовательно выдаёт вероятные простые из [low, high] по возрастанию.
+    Диапазон обрабатывается окнами: каждое окно за один проход просеивается
+    по SMALL_PRIMES, тест Миллера–Рабина выполняется только для выживших.
+    """
+    low = max(low, 0)
+    if window is None:
+        window = 16 * high.bit_length() + 256
+    start = low
+    while start <= high:
+        length = min(window, high - start + 1)
+        alive = _sieve_window(start, length)
+        for off in range(length):
+            if alive[off] and is_probable_prime(start + off):
+                yield start + off
+        start += length
+
+def generate_prime_between(low: int, high: int, incremental: bool = True) -> int:
+    """
+    Генерирует вероятное простое между low и high (включительно).
+    incremental=True: случайная стартовая точка и поиск вперёд по просеянным окнам
+    (iter_primes_between), при достижении high поиск продолжается от low.
+    Распределение не строго равномерное: вероятность простого пропорциональна
+    длине промежутка перед ним.
+    incremental=False: прежний режим — независимые случайные кандидаты.
+    """
     if low >= high:
         raise ValueError("low должен быть < high")
-    while True:
-        candidate = random.randint(low, high)
-        if candidate >= 2 and is_probable_prime(candidate, k=8):
-            return candidate
+    if not incremental:
+        while True:
+            candidate = random.randint(low, high)
+            if candidate >= 2 and is_probable_prime(candidate):
+                return candidate
+    start = random.randint(low, high)
+    for candidate in iter_primes_between(start, high):
+        return candidate
+    for candidate in iter_primes_between(low, start - 1):
+        return candidate
+    raise ValueError(f"В диапазоне [{low}, {high}] нет простых чисел.")
 
 def discrete_log_interactive():
     print("Решение дискретного логарифма y = a^x mod p.")
@@ -216,8 +1676,40 @@ def discrete_log_interactive():
         print(f"gcd(a,p) != 1 (gcd={math.gcd(a,p)}). BSGS в этой реализации ожидает взаимной простоты.")
         return None
 
-    print("Ищу x такое, что y ≡ a^x (mod p)...")
-    x = baby_step_giant_step(a, y, p)
+    print("Метод решения:")
+    print("1) Шаг младенца — шаг великана (память O(sqrt p))")
+    print("2) ρ-метод Полларда (память O(1) на процесс, a должно быть первообразным корнем)")
+    print("3) Полиг — Хеллман по разложению p - 1 (BSGS, если p - 1 не гладкое)")
+    print("4) BSGS с ограничением времени, прогрессом и контрольной точкой")
+    print("5) Исчисление индексов (p простое, a — первообразный корень)")
+    method = input("Ваш выбор (Enter — 1): ").strip() or "1"
+    if method == "5":
+        print("Ищу x такое, что y ≡ a^x (mod p)...")
+        x = index_calculus_log(a, y, p, workers=os.cpu_count() or 1)
+    elif method == "4":
+        budget_str = input("Ограничение времени в секундах (Enter — без ограничения): ").strip()
+        path = input("Файл контрольной точки (Enter — bsgs_checkpoint.json): ").strip() or "bsgs_checkpoint.json"
+        print("Ищу x такое, что y ≡ a^x (mod p)...")
+        res = baby_step_giant_step_resumable(a, y, p, path, float(budget_str) if budget_str else None,
+                                             progress=print_progress)
+        if res["status"] == "paused":
+            print(f"Остановлено на шаге великана {res['giant_index']} из {res['giant_steps']}; "
+                  f"повторный запуск с файлом {path} продолжит поиск.")
+            return None
+        x = res["x"]
+    elif method == "3":
+        print("Ищу x такое, что y ≡ a^x (mod p)...")
+        x = discrete_log(a, y, p, workers=os.cpu_count() or 1)
+    elif method == "2":
+        workers_str = input(f"Число процессов (Enter — {os.cpu_count() or 1}): ").strip()
+        workers = int(workers_str) if workers_str else (os.cpu_count() or 1)
+        print("Ищу x такое, что y ≡ a^x (mod p)...")
+        x = pollard_rho_log(a, y, p, workers=workers)
+    else:
+        table = input("Таблица шагов младенца: dict или compact (Enter — dict): ").strip() or "dict"
+        budget_str = input("Ограничение памяти таблицы в байтах (Enter — без ограничения): ").strip()
+        print("Ищу x такое, что y ≡ a^x (mod p)...")
+        x = baby_step_giant_step(a, y, p, table, int(budget_str) if budget_str else None)
     if x is None:
         print("Решение не найдено (в диапазоне поиска).")
     else:
@@ -239,6 +1731,8 @@ def main():
         print("4) Проверка числа на простоту (Ферма)")
         print("5) Обобщённый алгоритм Евклида (НОД + x, y)")
         print("6) Дискретный логарифм (метод 'шаг младенца — шаг великана')")
+        print("7) Сравнение таблиц шагов младенца (dict / compact)")
+        print("8) Сравнение методов дискретного логарифма (BSGS / ρ / исчисление индексов)")
         print("0) Выход")
         choice = input("Ваш выбор: ").strip()
 
@@ -264,8 +1758,8 @@ def main():
         elif choice == "3":
             try:
                 n = int(input("Введите n: "))
-                k = int(input("Введите количество итераций теста (например 5): "))
-                res = is_probable_prime(n, k)
+                k_str = input("Количество итераций теста (Enter — по длине n): ").strip()
+                res = is_probable_prime(n, int(k_str) if k_str else None)
                 print("Вероятно простое" if res else "Составное")
             except ValueError as e:
                 print("Ошибка:", e)
@@ -293,6 +1787,21 @@ def main():
             except ValueError as e:
                 print("Ошибка:", e)
 
+        elif choice == "7":
+            try:
+                m_str = input("Число записей таблицы (Enter — 262144): ").strip()
+                benchmark_bsgs_tables(int(m_str) if m_str else 1 << 18)
+            except ValueError as e:
+                print("Ошибка:", e)
+
+        elif choice == "8":
+            try:
+                bits_str = input("Длины p в битах через пробел (Enter — 24 32 40 48): ").strip()
+                bit_sizes = [int(b) for b in bits_str.split()] if bits_str else (24, 32, 40, 48)
+                benchmark_discrete_log(bit_sizes, workers=os.cpu_count() or 1)
+            except ValueError as e:
+                print("Ошибка:", e)
+
         elif choice == "0":
             print("Выход.")
             break
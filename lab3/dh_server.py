@@ -0,0 +1,287 @@
+"""
+Асинхронный сервер и клиент обмена ключами Диффи-Хеллмана (Лаб.3) по TCP или
+UNIX-сокету и генератор нагрузки.
+
+Протокол (каждый кадр — длина uint32 big-endian и данные):
+  клиент -> сервер: имя стандартной группы (modp_group), A = g^a mod p;
+    сервер принимает только группу, с которой запущен;
+  сервер -> клиент: B = g^b mod p, подтверждение SHA-256(K || A || B);
+  клиент вычисляет K = B^a mod p и сверяет подтверждение.
+
+Возведения в степень выполняются в пуле процессов (run_in_executor), поэтому
+цикл событий продолжает принимать соединения, пока считаются ключи. При workers = 0
+всё считается прямо в цикле событий (для сравнения).
+"""
+import asyncio
+import hashlib
+import os
+import secrets
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from lab3 import fixed_base_table, mod_pow, modp_group, modp_group_names
+
+DEFAULT_GROUP = "ffdhe2048"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5003
+MAX_FRAME = 1 << 16
+# Сколько секунд ждать кадр от собеседника: молчащий клиент не держит соединение вечно
+READ_TIMEOUT = 10.0
+
+# -------------------------
+# Кадры и вычисления (выполняются в процессах пула)
+# -------------------------
+
+async def _read_frame_unbounded(reader: asyncio.StreamReader) -> bytes:
+    (length,) = struct.unpack(">I", await reader.readexactly(4))
+    if length > MAX_FRAME:
+        raise ValueError(f"Слишком длинный кадр: {length} байт.")
+    return await reader.readexactly(length)
+
+async def _read_frame(reader: asyncio.StreamReader, timeout: float = READ_TIMEOUT) -> bytes:
+    """Читает кадр целиком не дольше timeout секунд (иначе asyncio.TimeoutError)."""
+    return await asyncio.wait_for(_read_frame_unbounded(reader), timeout)
+
+def _write_frame(writer: asyncio.StreamWriter, data: bytes) -> None:
+    writer.write(struct.pack(">I", len(data)) + data)
+
+def _int_bytes(x: int, p: int) -> bytes:
+    return x.to_bytes((p.bit_length() + 7) // 8, "big")
+
+def _confirmation(k: int, a_pub: int, b_pub: int, p: int) -> bytes:
+    return hashlib.sha256(_int_bytes(k, p) + _int_bytes(a_pub, p) + _int_bytes(b_pub, p)).digest()
+
+def _warm_up(group: str) -> None:
+    """Инициализатор процесса пула: простое группы и таблица степеней g строятся заранее."""
+    p, g = modp_group(group)
+    fixed_base_table(g, p)
+
+def _key_pair(group: str) -> Tuple[int, int]:
+    """Секрет x из криптостойкого генератора (secrets, а не random) и g^x mod p."""
+    p, g = modp_group(group)
+    x = secrets.randbelow(p - 3) + 2
+    return x, fixed_base_table(g, p).pow(x)
+
+def _server_exchange(group: str, a_pub: int) -> Tuple[int, bytes]:
+    """Ответ сервера: B = g^b mod p и подтверждение общего ключа K = A^b mod p."""
+    p, _ = modp_group(group)
+    b, b_pub = _key_pair(group)
+    return b_pub, _confirmation(mod_pow(a_pub, b, p), a_pub, b_pub, p)
+
+def _client_shared(group: str, a: int, b_pub: int) -> int:
+    p, _ = modp_group(group)
+    return mod_pow(b_pub, a, p)
+
+async def _offload(executor: Optional[ProcessPoolExecutor], fn, *args):
+    if executor is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    """Закрывает соединение и дожидается закрытия; ошибки сокета при этом не маскируют исходные."""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+def _check_public(y: int, p: int) -> None:
+    if not 1 < y < p - 1:
+        raise ValueError("Открытый ключ вне диапазона 2..p-2.")
+
+# -------------------------
+# Сервер
+# -------------------------
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, group: str,
+                  executor: Optional[ProcessPoolExecutor], stats: Dict[str, int]) -> None:
+    try:
+        # пул прогрет только для группы сервера: другие группы не принимаются
+        if (await _read_frame(reader)).decode() != group:
+            raise ValueError("Группа клиента не совпадает с группой сервера.")
+        p, _ = modp_group(group)
+        a_pub = int.from_bytes(await _read_frame(reader), "big")
+        _check_public(a_pub, p)
+        b_pub, confirm = await _offload(executor, _server_exchange, group, a_pub)
+        _write_frame(writer, _int_bytes(b_pub, p))
+        _write_frame(writer, confirm)
+        await writer.drain()
+        stats["handshakes"] += 1
+    except Exception:
+        # любой сбой рукопожатия, в том числе тайм-аут чтения и сбой пула (BrokenProcessPool)
+        stats["errors"] += 1
+    finally:
+        await _close(writer)
+
+async def start_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None,
+                       executor: Optional[ProcessPoolExecutor] = None,
+                       group: str = DEFAULT_GROUP) -> Tuple[asyncio.AbstractServer, Dict[str, int]]:
+    """
+    Запускает сервер группы group на host:port (port = 0 — свободный порт) или на
+    UNIX-сокете path. Возвращает сервер и счётчики {"handshakes", "errors"}.
+    """
+    modp_group(group)
+    stats = {"handshakes": 0, "errors": 0}
+
+    async def handler(reader, writer):
+        await _handle(reader, writer, group, executor, stats)
+
+    if path is not None:
+        server = await asyncio.start_unix_server(handler, path, backlog=1024)
+    else:
+        server = await asyncio.start_server(handler, host, port, backlog=1024)
+    return server, stats
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None,
+                workers: int = None, group: str = DEFAULT_GROUP) -> None:
+    """Обслуживает клиентов группы group до прерывания (Ctrl+C)."""
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    executor = ProcessPoolExecutor(workers, initializer=_warm_up, initargs=(group,)) if workers > 0 else None
+    try:
+        server, stats = await start_server(host, port, path, executor, group)
+        print(f"Сервер слушает {path or f'{host}:{port}'} ({workers} процесс(ов))")
+        async with server:
+            await server.serve_forever()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+# -------------------------
+# Клиент и генератор нагрузки
+# -------------------------
+
+async def handshake(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None,
+                    group: str = DEFAULT_GROUP, executor: Optional[ProcessPoolExecutor] = None) -> int:
+    """Одно рукопожатие с сервером; возвращает общий ключ, ValueError — если подтверждение не сошлось."""
+    p, _ = modp_group(group)
+    a, a_pub = await _offload(executor, _key_pair, group)
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _write_frame(writer, group.encode())
+        _write_frame(writer, _int_bytes(a_pub, p))
+        await writer.drain()
+        b_pub = int.from_bytes(await _read_frame(reader), "big")
+        confirm = await _read_frame(reader)
+    finally:
+        await _close(writer)
+    _check_public(b_pub, p)
+    k = await _offload(executor, _client_shared, group, a, b_pub)
+    if _confirmation(k, a_pub, b_pub, p) != confirm:
+        raise ValueError("Подтверждение ключа не совпало.")
+    return k
+
+async def run_load(total: int = 1000, concurrency: int = 64, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                   path: Optional[str] = None, group: str = DEFAULT_GROUP,
+                   executor: Optional[ProcessPoolExecutor] = None) -> Dict[str, float]:
+    """
+    Выполняет total рукопожатий, не более concurrency одновременно, и печатает
+    пропускную способность (рукопожатий/с) и задержки p50/p99 одного рукопожатия.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await handshake(host, port, path, group, executor)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    result = {"handshakes": len(latencies), "errors": errors, "seconds": elapsed,
+              "per_sec": len(latencies) / elapsed if elapsed else 0.0,
+              "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+              "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0}
+    print(f"{result['handshakes']} рукопожатий ({errors} ошибок) за {elapsed:.2f} с: "
+          f"{result['per_sec']:.1f} 1/с, p50 = {result['p50_ms']:.1f} мс, p99 = {result['p99_ms']:.1f} мс")
+    return result
+
+async def benchmark_handshakes(total: int = 1000, concurrency: int = 64, group: str = DEFAULT_GROUP,
+                               server_workers: int = None, client_workers: int = None,
+                               path: Optional[str] = None) -> Dict[str, float]:
+    """Нагрузочный тест против сервера, запущенного в этом же процессе (свободный порт или UNIX-сокет)."""
+    cpus = os.cpu_count() or 1
+    server_workers = cpus if server_workers is None else server_workers
+    client_workers = cpus if client_workers is None else client_workers
+    server_pool = ProcessPoolExecutor(server_workers, initializer=_warm_up, initargs=(group,)) if server_workers > 0 else None
+    client_pool = ProcessPoolExecutor(client_workers, initializer=_warm_up, initargs=(group,)) if client_workers > 0 else None
+    _warm_up(group)
+    try:
+        server, stats = await start_server(port=0, path=path, executor=server_pool, group=group)
+        async with server:
+            port = server.sockets[0].getsockname()[1] if path is None else DEFAULT_PORT
+            print(f"Группа {group}, сервер: {server_workers} процесс(ов), клиент: {client_workers} процесс(ов), "
+                  f"{concurrency} одновременных соединений")
+            result = await run_load(total, concurrency, DEFAULT_HOST, port, path, group, client_pool)
+        result["server_errors"] = stats["errors"]
+        return result
+    finally:
+        for pool in (server_pool, client_pool):
+            if pool is not None:
+                pool.shutdown()
+
+def _parse_address(text: str) -> Tuple[str, int, Optional[str]]:
+    """"host:port" или путь к UNIX-сокету (содержит "/"); пустая строка — адрес по умолчанию."""
+    if not text:
+        return DEFAULT_HOST, DEFAULT_PORT, None
+    if "/" in text:
+        return DEFAULT_HOST, DEFAULT_PORT, text
+    host, _, port = text.rpartition(":")
+    return host or DEFAULT_HOST, int(port), None
+
+def main():
+    print("=== Диффи-Хеллман по сети (asyncio) ===")
+    print("1) Запустить сервер")
+    print("2) Одно рукопожатие с сервером")
+    print("3) Нагрузочный тест внешнего сервера")
+    print("4) Нагрузочный тест (сервер в этом же процессе)")
+    choice = input("Ваш выбор: ").strip()
+    try:
+        print("Доступные группы: " + ", ".join(modp_group_names()))
+        group = input(f"Группа (Enter — {DEFAULT_GROUP}): ").strip() or DEFAULT_GROUP
+        modp_group(group)
+        if choice in ("1", "2", "3"):
+            host, port, path = _parse_address(input(
+                f"Адрес (host:port или путь к UNIX-сокету, Enter — {DEFAULT_HOST}:{DEFAULT_PORT}): ").strip())
+        if choice == "1":
+            workers = input("Число процессов пула (Enter — по числу ядер, 0 — без пула): ").strip()
+            asyncio.run(serve(host, port, path, int(workers) if workers else None, group))
+        elif choice == "2":
+            key = asyncio.run(handshake(host, port, path, group))
+            print(f"Общий ключ = {key}")
+        elif choice in ("3", "4"):
+            total = int(input("Число рукопожатий (Enter — 1000): ").strip() or 1000)
+            concurrency = int(input("Одновременных соединений (Enter — 64): ").strip() or 64)
+            if choice == "3":
+                async def load():
+                    with ProcessPoolExecutor(os.cpu_count() or 1, initializer=_warm_up, initargs=(group,)) as pool:
+                        return await run_load(total, concurrency, host, port, path, group, pool)
+                asyncio.run(load())
+            else:
+                asyncio.run(benchmark_handshakes(total, concurrency, group))
+        else:
+            print("Неверный выбор.")
+    except asyncio.TimeoutError:
+        print("Ошибка: сервер не ответил за", READ_TIMEOUT, "с.")
+    except asyncio.IncompleteReadError:
+        print("Ошибка: сервер закрыл соединение (например, не принял группу).")
+    except (OSError, ValueError) as e:
+        print("Ошибка:", e)
+    except KeyboardInterrupt:
+        print("Остановлено.")
+
+if __name__ == "__main__":
+    main()
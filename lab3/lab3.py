@@ -1,11 +1,64 @@
+import hashlib
+import os
+import queue
 import random
-from typing import Tuple, Optional, Dict, List
+import struct
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Tuple, Optional, Dict, List, Iterable, Iterator
 import math
 
 # -------------------------
 # Core algorithms
 # -------------------------
 
+def _window_size(bits: int) -> int:
+    """
+    Ширина окна k для показателя длиной bits бит.
+    Минимизирует число умножений: 2^(k-1) предвычислений + bits/(k+1) умножений окна.
+    """
+    best_k, best_cost = 1, bits
+    for k in range(2, 9):
+        cost = (1 << (k - 1)) + bits / (k + 1)
+        if cost < best_cost:
+            best_k, best_cost = k, cost
+    return best_k
+
+def _sliding_window_pow(base: int, exp: int, p: int) -> int:
+    """Возведение base^exp mod p методом скользящего окна (exp >= 0, 0 <= base < p)."""
+    if exp == 0:
+        return 1 % p
+    bits = bin(exp)[2:]
+    k = _window_size(len(bits))
+    # Нечётные степени: base^1, base^3, ..., base^(2^k - 1)
+    table = [base]
+    if k > 1:
+        sq = (base * base) % p
+        for _ in range((1 << (k - 1)) - 1):
+            table.append((table[-1] * sq) % p)
+    result = None
+    i = 0
+    n = len(bits)
+    while i < n:
+        if bits[i] == "0":
+            result = (result * result) % p
+            i += 1
+            continue
+        # окно bits[i:j] длиной не более k, заканчивающееся единицей
+        j = min(i + k, n)
+        while bits[j - 1] == "0":
+            j -= 1
+        window = int(bits[i:j], 2)
+        if result is None:
+            result = table[window >> 1]
+        else:
+            for _ in range(j - i):
+                result = (result * result) % p
+            result = (result * table[window >> 1]) % p
+        i = j
+    return result
+
 def mod_pow(a: int, x: int, p: int) -> int:
     if p <= 0:
         raise ValueError("Модуль p должен быть положительным целым числом.")
@@ -16,23 +69,66 @@ def mod_pow(a: int, x: int, p: int) -> int:
         inv = mod_inv(a, p)
         x = -x
         a = inv
-    result = 1 % p
-    base = a % p
-    exp = x
-    while exp > 0:
-        if exp & 1:
-            result = (result * base) % p
-        base = (base * base) % p
-        exp >>= 1
-    return result
+    return _sliding_window_pow(a, x, p)
+
+_LEHMER_DIGIT_BITS = 62
+
+def _lehmer_extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
+    """
+    Расширенный алгоритм Евклида с ускорением Лемера для a >= b >= 0.
+    Пока числа длинные, последовательность частных моделируется на старших
+    62 битах машинными (малыми) числами, а к длинным числам применяется
+    накопленная матрица 2x2 — одно длинное умножение вместо многих делений.
+    """
+    u0, u1 = 1, 0
+    v0, v1 = 0, 1
+    while b.bit_length() > _LEHMER_DIGIT_BITS:
+        shift = a.bit_length() - _LEHMER_DIGIT_BITS
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C != 0 and bh + D != 0:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            u0, u1 = u1, u0 - q * u1
+            v0, v1 = v1, v0 - q * v1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            u0, u1 = A * u0 + B * u1, C * u0 + D * u1
+            v0, v1 = A * v0 + B * v1, C * v0 + D * v1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        u0, u1 = u1, u0 - q * u1
+        v0, v1 = v1, v0 - q * v1
+    return (a, u0, v0)
 
 def extended_gcd(a: int, b: int) -> Tuple[int,int,int]:
-    if b == 0:
-        return (abs(a), 1 if a >= 0 else -1, 0)
-    g, x1, y1 = extended_gcd(b, a % b)
-    x = y1
-    y = x1 - (a // b) * y1
-    return (g, x, y)
+    """
+    Обобщённый алгоритм Евклида без рекурсии: возвращает (g, x, y), a*x + b*y = g.
+    Для неотрицательных a, b используется ускорение Лемера.
+    """
+    if a >= 0 and b >= 0:
+        if a >= b:
+            return _lehmer_extended_gcd(a, b)
+        g, x, y = _lehmer_extended_gcd(b, a)
+        return (g, y, x)
+    x0, x1 = 1, 0
+    y0, y1 = 0, 1
+    while b != 0:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        return (-a, -x0, -y0)
+    return (a, x0, y0)
 
 def mod_inv(a: int, p: int) -> int:
     if p <= 0:
@@ -43,34 +139,223 @@ def mod_inv(a: int, p: int) -> int:
         raise ValueError(f"Обратной не существует, gcd({a},{p}) = {g} ≠ 1.")
     return x % p
 
-def is_probable_prime(n: int, k: int = 5) -> bool:
-    """Вероятностный тест Миллера–Рабина"""
+class FixedBasePow:
+    """
+    Возведение фиксированного основания g в произвольные степени по модулю p
+    с предвычисленной таблицей (оконный метод с фиксированным основанием).
+
+    table[i][d-1] = g^(d * 2^(w*i)) mod p, d = 1..2^w-1, поэтому g^x считается
+    за ceil(bits/w) умножений без возведений в квадрат. Таблица строится один раз
+    на пару (g, p) и переиспользуется для всех последующих показателей.
+
+    Объём таблицы: ceil(max_bits/w) * (2^w - 1) вычетов. Ширина окна w задаётся явно
+    (window) либо выбирается как наибольшая (не более 8), при которой таблица
+    укладывается в max_bytes. max_bytes — жёсткий предел: если в него не укладывается
+    даже w = 1, таблица не строится и все степени считаются обычным mod_pow; явно
+    заданное окно, превышающее предел, — ValueError. Показатели длиннее max_bits
+    и отрицательные показатели также обрабатываются обычным mod_pow.
+    """
+
+    def __init__(self, g: int, p: int, max_bits: int = None, window: int = None, max_bytes: int = 4 << 20):
+        if p <= 0:
+            raise ValueError("Модуль p должен быть положительным целым числом.")
+        self.g = g % p
+        self.p = p
+        self.max_bits = max_bits if max_bits is not None else p.bit_length()
+        entry_bytes = (p.bit_length() + 7) // 8 or 1
+        def table_bytes(w: int) -> int:
+            return max(1, -(-self.max_bits // w)) * ((1 << w) - 1) * entry_bytes
+        self.table = []
+        if window is None:
+            fitting = [w for w in range(1, 9) if table_bytes(w) <= max_bytes]
+            if not fitting:
+                self.window = 0
+                self.memory_bytes = 0
+                return
+            window = fitting[-1]
+        if window < 1:
+            raise ValueError("Ширина окна должна быть >= 1.")
+        if table_bytes(window) > max_bytes:
+            raise ValueError(f"Таблица с окном {window} ({table_bytes(window)} байт) превышает max_bytes = {max_bytes}.")
+        self.window = window
+        rows = max(1, -(-self.max_bits // window))
+        base = self.g
+        for _ in range(rows):
+            row = [base]
+            for _ in range((1 << window) - 2):
+                row.append((row[-1] * base) % p)
+            self.table.append(row)
+            base = (row[-1] * base) % p
+        self.memory_bytes = rows * ((1 << window) - 1) * entry_bytes
+
+    def pow(self, x: int) -> int:
+        """Возвращает g^x mod p."""
+        if not self.table or x < 0 or x.bit_length() > self.max_bits:
+            return mod_pow(self.g, x, self.p)
+        p = self.p
+        mask = (1 << self.window) - 1
+        result = 1 % p
+        for row in self.table:
+            if not x:
+                break
+            d = x & mask
+            if d:
+                result = (result * row[d - 1]) % p
+            x >>= self.window
+        return result
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет таблицу в двоичный файл: сигнатура FIXED_BASE_MAGIC, window, max_bits,
+        число строк и длина вычета L в байтах (uint32, little-endian), затем g, p
+        и все элементы таблицы по L байт (big-endian).
+        """
+        entry_bytes = (self.p.bit_length() + 7) // 8 or 1
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(FIXED_BASE_MAGIC + struct.pack("<IIII", self.window, self.max_bits, len(self.table), entry_bytes))
+            f.write(self.g.to_bytes(entry_bytes, "big") + self.p.to_bytes(entry_bytes, "big"))
+            for row in self.table:
+                f.write(b"".join(v.to_bytes(entry_bytes, "big") for v in row))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FixedBasePow":
+        """Читает таблицу, сохранённую методом save (без повторного построения)."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:8] != FIXED_BASE_MAGIC:
+            raise ValueError(f"Файл {path} не является таблицей FixedBasePow.")
+        window, max_bits, rows, entry_bytes = struct.unpack_from("<IIII", data, 8)
+        width = (1 << window) - 1
+        offset = 24
+        if len(data) != offset + entry_bytes * (2 + rows * width):
+            raise ValueError(f"Файл {path} повреждён.")
+        values = [int.from_bytes(data[i:i + entry_bytes], "big")
+                  for i in range(offset, len(data), entry_bytes)]
+        obj = cls.__new__(cls)
+        obj.g, obj.p = values[0], values[1]
+        obj.window, obj.max_bits = window, max_bits
+        obj.table = [values[2 + r * width:2 + (r + 1) * width] for r in range(rows)]
+        obj.memory_bytes = rows * width * entry_bytes
+        return obj
+
+FIXED_BASE_MAGIC = b"FBPOWTB1"
+
+@lru_cache(maxsize=16)
+def fixed_base_table(g: int, p: int) -> FixedBasePow:
+    """Таблица степеней g по модулю p, строится один раз на пару (g, p)."""
+    return FixedBasePow(g, p)
+
+# Каталог дискового кеша таблиц FixedBasePow для стандартных групп
+DH_TABLE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lab3_dh_tables")
+
+@lru_cache(maxsize=16)
+def cached_fixed_base_table(g: int, p: int, cache_dir: str = None) -> FixedBasePow:
+    """
+    Таблица степеней g по модулю p с кешем на диске: файл в cache_dir (по умолчанию
+    DH_TABLE_CACHE_DIR) именуется по SHA-256 от (g, p). Если файл есть, таблица
+    читается из него, иначе строится и сохраняется; ошибки записи кеша не мешают работе.
+    """
+    cache_dir = cache_dir or DH_TABLE_CACHE_DIR
+    digest = hashlib.sha256(f"{g}:{p}".encode()).hexdigest()[:32]
+    path = os.path.join(cache_dir, f"fbpow_{digest}.bin")
+    if os.path.exists(path):
+        try:
+            table = FixedBasePow.load(path)
+            if table.g == g % p and table.p == p:
+                return table
+        except (OSError, ValueError):
+            pass
+    table = FixedBasePow(g, p)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        table.save(path)
+    except OSError:
+        pass
+    return table
+
+def _sieve_primes(limit: int) -> List[int]:
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Первые 2048 простых (до 17863) и их произведение для отсева одним gcd
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# Доказанные детерминированные наборы оснований Миллера–Рабина: (граница n, основания)
+_MR_DETERMINISTIC_BASES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+def _mr_rounds_for_bits(bits: int) -> int:
+    """Число раундов со случайными основаниями для случайного кандидата (ошибка < 2^-128)."""
+    if bits >= 3747:
+        return 3
+    if bits >= 1345:
+        return 4
+    if bits >= 476:
+        return 5
+    if bits >= 400:
+        return 6
+    if bits >= 347:
+        return 7
+    if bits >= 308:
+        return 8
+    return 27
+
+def _miller_rabin_round(n: int, d: int, s: int, a: int) -> bool:
+    """Один раунд Миллера–Рабина по основанию a (n - 1 = d * 2^s). True — n прошло раунд."""
+    x = mod_pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = (x * x) % n
+        if x == n - 1:
+            return True
+    return False
+
+def is_probable_prime(n: int, k: int = None) -> bool:
+    """
+    Тест простоты Миллера–Рабина с предварительным отсевом.
+    1) Делимость на первые 2048 простых проверяется одним gcd с их произведением.
+    2) Для n < 3.3·10^24 используются доказанные детерминированные наборы оснований
+       (результат точный, k не используется).
+    3) Для больших n выполняется k раундов со случайными основаниями; если k не задано,
+       число раундов выбирается по битовой длине n.
+    """
     if n < 2:
         return False
-    small_primes = [2,3,5,7,11,13,17,19,23,29]
-    for p in small_primes:
-        if n == p:
-            return True
-        if n % p == 0:
-            return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if math.gcd(n, _PRIMORIAL) != 1:
+        return False
     # write n-1 as d * 2^s
     d = n - 1
-    s = 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    for _ in range(k):
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for bound, bases in _MR_DETERMINISTIC_BASES:
+        if n < bound:
+            return all(_miller_rabin_round(n, d, s, a) for a in bases)
+    rounds = k if k is not None else _mr_rounds_for_bits(n.bit_length())
+    for _ in range(rounds):
         a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        composite = True
-        for _ in range(s - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                composite = False
-                break
-        if composite:
+        if not _miller_rabin_round(n, d, s, a):
             return False
     return True
 
@@ -149,14 +434,311 @@ def baby_step_giant_step(a: int, y: int, p: int) -> Optional[int]:
         gamma = (gamma * a_m_inv) % p
     return None
 
-def generate_prime_between(low: int, high: int) -> int:
-    """Генерирует вероятное простое между low и high (включительно)."""
+def _sieve_window(start: int, length: int) -> bytearray:
+    """
+    Решето на окне [start, start + length): единица — число не делится ни на одно
+    из SMALL_PRIMES (сами малые простые не вычёркиваются).
+    """
+    alive = bytearray([1]) * length
+    for i in range(min(2, start), 2):
+        if i - start < length:
+            alive[i - start] = 0
+    for q in SMALL_PRIMES:
+        off = (-start) % q
+        if start + off <= q:
+            off = 2 * q - start
+        if off < length:
+            alive[off::q] = bytes(len(range(off, length, q)))
+    return alive
+
+def iter_primes_between(low: int, high: int, window: int = None) -> Iterator[int]:
+    """
+    Последовательно выдаёт вероятные простые из [low, high] по возрастанию.
+    Диапазон обрабатывается окнами: каждое окно за один проход просеивается
+    по SMALL_PRIMES, тест Миллера–Рабина выполняется только для выживших.
+    """
+    low = max(low, 0)
+    if window is None:
+        window = 16 * high.bit_length() + 256
+    start = low
+    while start <= high:
+        length = min(window, high - start + 1)
+        alive = _sieve_window(start, length)
+        for off in range(length):
+            if alive[off] and is_probable_prime(start + off):
+                yield start + off
+        start += length
+
+def generate_prime_between(low: int, high: int, incremental: bool = True) -> int:
+    """
+    Генерирует вероятное простое между low и high (включительно).
+    incremental=True: случайная стартовая точка и поиск вперёд по просеянным окнам
+    (iter_primes_between), при достижении high поиск продолжается от low.
+    Распределение не строго равномерное: вероятность простого пропорциональна
+    длине промежутка перед ним.
+    incremental=False: прежний режим — независимые случайные кандидаты.
+    """
     if low >= high:
         raise ValueError("low должен быть < high")
-    while True:
-        candidate = random.randint(low, high)
-        if candidate >= 2 and is_probable_prime(candidate, k=8):
-            return candidate
+    if not incremental:
+        while True:
+            candidate = random.randint(low, high)
+            if candidate >= 2 and is_probable_prime(candidate):
+                return candidate
+    start = random.randint(low, high)
+    for candidate in iter_primes_between(start, high):
+        return candidate
+    for candidate in iter_primes_between(low, start - 1):
+        return candidate
+    raise ValueError(f"В диапазоне [{low}, {high}] нет простых чисел.")
+
+# Граница совместного решета для безопасных простых: кандидат выживает, только если
+# ни q, ни 2q + 1 не делятся на нечётные простые до SAFE_SIEVE_LIMIT
+SAFE_SIEVE_LIMIT = 1 << 20
+
+@lru_cache(maxsize=1)
+def _safe_sieve_primes() -> List[int]:
+    """Нечётные простые до SAFE_SIEVE_LIMIT (решето строится при первом обращении)."""
+    return _sieve_primes(SAFE_SIEVE_LIMIT)[1:]
+
+def _safe_sieve_window(start: int, length: int) -> bytearray:
+    """
+    Совместное решето для безопасных простых на окне q из [start, start + length):
+    единица — q нечётно (или q = 2) и ни q, ни 2q + 1 не делятся на нечётные простые r
+    до SAFE_SIEVE_LIMIT. Для каждого r вычёркиваются q ≡ 0 (mod r) и q ≡ (r - 1)/2 (mod r),
+    т.е. r | 2q + 1; сами q = r и q = (r - 1)/2 (2q + 1 = r) не вычёркиваются.
+    """
+    alive = bytearray([1]) * length
+    off = start % 2
+    alive[off::2] = bytes(len(range(off, length, 2)))
+    for q in (1, 2):
+        if 0 <= q - start < length:
+            alive[q - start] = q == 2
+    end = start + length
+    for r in _safe_sieve_primes():
+        if r > 2 * end:
+            break
+        for residue, exempt in ((0, r), ((r - 1) // 2, (r - 1) // 2)):
+            off = (residue - start) % r
+            if start + off == exempt:
+                off += r
+            if off < length:
+                alive[off::r] = bytes(len(range(off, length, r)))
+    return alive
+
+def _safe_prime_candidates(start: int, length: int) -> Iterator[int]:
+    """
+    Безопасные простые p = 2q + 1 для q из просеянного окна [start, start + length).
+    Для выживших q сначала выполняется тест Ферма по основанию 2 для q и p, затем
+    полный тест Миллера–Рабина для q. Простота p при простом q следует из критерия
+    Поклингтона: 2^(p-1) ≡ 1 (mod p) и gcd(2^2 - 1, p) = 1 при p > 3.
+    """
+    alive = _safe_sieve_window(start, length)
+    for off in range(length):
+        if not alive[off]:
+            continue
+        q = start + off
+        p = 2 * q + 1
+        if q <= SMALL_PRIMES[-1]:
+            if is_probable_prime(q) and is_probable_prime(p):
+                yield p
+            continue
+        if mod_pow(2, q - 1, q) != 1 or mod_pow(2, p - 1, p) != 1:
+            continue
+        if is_probable_prime(q):
+            yield p
+
+def _safe_prime_task(start: int, length: int) -> Optional[int]:
+    """Первое безопасное простое из окна q [start, start + length) либо None (задание пула)."""
+    for p in _safe_prime_candidates(start, length):
+        return p
+    return None
+
+def _safe_window_length(high: int) -> int:
+    return 64 * high.bit_length() + 1024
+
+def iter_safe_primes_between(low: int, high: int, window: int = None) -> Iterator[int]:
+    """Последовательно выдаёт безопасные простые p = 2q + 1 из [low, high] по возрастанию."""
+    q_low = max(low // 2, 1)
+    q_high = (high - 1) // 2
+    if window is None:
+        window = _safe_window_length(high)
+    start = q_low
+    while start <= q_high:
+        length = min(window, q_high - start + 1)
+        yield from _safe_prime_candidates(start, length)
+        start += length
+
+def generate_safe_prime_between(low: int, high: int, workers: int = 1) -> int:
+    """
+    Безопасное простое p = 2q + 1 из [low, high]: поиск вперёд от случайной точки
+    по iter_safe_primes_between, при достижении high — от low.
+    При workers > 1 случайные окна q просеиваются и проверяются в пуле процессов
+    (в работе 2 * workers окон), первое найденное p возвращается, пул завершается.
+    """
+    if low >= high:
+        raise ValueError("low должен быть < high")
+    q_low, q_high = max(low // 2, 1), (high - 1) // 2
+    window = _safe_window_length(high)
+    if workers > 1 and q_high - q_low > 4 * workers * window:
+        results = queue.Queue()
+        with Pool(workers) as pool:
+            def submit():
+                start = random.randint(q_low, q_high - window + 1)
+                pool.apply_async(_safe_prime_task, (start, window),
+                                 callback=results.put, error_callback=results.put)
+            for _ in range(2 * workers):
+                submit()
+            while True:
+                p = results.get()
+                if isinstance(p, BaseException):
+                    raise p
+                if p is not None:
+                    return p
+                submit()
+    start = random.randint(low, high)
+    for p in iter_safe_primes_between(start, high):
+        return p
+    for p in iter_safe_primes_between(low, start - 1):
+        return p
+    raise ValueError(f"В диапазоне [{low}, {high}] нет безопасных простых чисел.")
+
+def generate_safe_prime(bits: int, workers: int = 1) -> int:
+    """Безопасное простое p = 2q + 1 длиной ровно bits бит."""
+    if bits < 3:
+        raise ValueError("Безопасное простое имеет длину не менее 3 бит.")
+    return generate_safe_prime_between(1 << (bits - 1), (1 << bits) - 1, workers)
+
+def is_safe_prime_generator(g: int, p: int) -> bool:
+    """
+    Для безопасного p = 2q + 1 порядок элемента делит 2q, поэтому g — первообразный
+    корень тогда и только тогда, когда g^2 ≠ 1 и g^q ≠ 1 (mod p).
+    """
+    g %= p
+    return mod_pow(g, 2, p) != 1 and mod_pow(g, (p - 1) // 2, p) != 1
+
+def find_safe_prime_generator(p: int) -> int:
+    """Наименьший первообразный корень по модулю безопасного простого p (без разложения p - 1)."""
+    for g in range(2, p):
+        if is_safe_prime_generator(g, p):
+            return g
+    raise ValueError(f"Для p = {p} не найден первообразный корень.")
+
+# Подгруппа Шнорра: p = kq + 1 с простым q длиной SCHNORR_Q_BITS, генератор порядка q
+# и секретные показатели меньше q — возведение в степень стоит ~q_bits, а не ~bits(p)
+SCHNORR_Q_BITS = 256
+
+def _schnorr_p_task(q: int, k_low: int, k_high: int, batch: int = 16) -> Optional[int]:
+    """batch попыток p = kq + 1 со случайным чётным k из [k_low, k_high]; простое p или None (задание пула)."""
+    for _ in range(batch):
+        p = 2 * random.randint(k_low // 2 + 1, k_high // 2) * q + 1
+        if is_probable_prime(p):
+            return p
+    return None
+
+def generate_schnorr_group(bits: int, q_bits: int = SCHNORR_Q_BITS, workers: int = 1) -> Tuple[int, int, int]:
+    """
+    Параметры (p, q, g): простое q длиной q_bits, простое p = kq + 1 длиной ровно bits
+    (как generate_parameters в Лаб.10) и g = h^((p-1)/q) ≠ 1 — генератор подгруппы порядка q.
+    При workers > 1 кандидаты k проверяются в пуле процессов (в работе 2 * workers заданий).
+    """
+    if bits < q_bits + 8:
+        raise ValueError("Длина p должна быть хотя бы на 8 бит больше длины q.")
+    q = generate_prime_between(1 << (q_bits - 1), (1 << q_bits) - 1)
+    k_low, k_high = (1 << (bits - 1)) // q, ((1 << bits) - 2) // q
+    p = None
+    if workers > 1:
+        results = queue.Queue()
+        with Pool(workers) as pool:
+            def submit():
+                pool.apply_async(_schnorr_p_task, (q, k_low, k_high),
+                                 callback=results.put, error_callback=results.put)
+            for _ in range(2 * workers):
+                submit()
+            while p is None:
+                p = results.get()
+                if isinstance(p, BaseException):
+                    raise p
+                if p is None:
+                    submit()
+    while p is None:
+        p = _schnorr_p_task(q, k_low, k_high)
+    cofactor = (p - 1) // q
+    for h in range(2, p - 1):
+        g = mod_pow(h, cofactor, p)
+        if g != 1:
+            return p, q, g
+    raise ValueError(f"Для p = {p} не найден генератор подгруппы порядка q.")
+
+def is_schnorr_subgroup_member(y: int, p: int, q: int) -> bool:
+    """Открытый ключ y лежит в подгруппе порядка q: 1 < y < p и y^q ≡ 1 (mod p)."""
+    return 1 < y < p and mod_pow(y, q, p) == 1
+
+# Стандартные группы RFC 3526 (MODP, константа π) и RFC 7919 (FFDHE, константа e), g = 2:
+# p = 2^n - 2^(n-64) - 1 + 2^64 * (floor(2^(n-130) * c) + k); modp1024 — группа 2 из RFC 2409.
+# Простые не хранятся в коде, а вычисляются при первом обращении (modp_group).
+_MODP_GROUPS = {
+    "modp1024": (1024, "pi", 129093),
+    "modp1536": (1536, "pi", 741804),
+    "modp2048": (2048, "pi", 124476),
+    "modp3072": (3072, "pi", 1690314),
+    "modp4096": (4096, "pi", 240904),
+    "modp6144": (6144, "pi", 929484),
+    "modp8192": (8192, "pi", 4743158),
+    "ffdhe2048": (2048, "e", 560316),
+    "ffdhe3072": (3072, "e", 2625351),
+    "ffdhe4096": (4096, "e", 5736041),
+    "ffdhe6144": (6144, "e", 15705020),
+    "ffdhe8192": (8192, "e", 10965728),
+}
+
+def _arctan_inv(x: int, one: int) -> int:
+    """arctg(1/x) * one в целочисленной арифметике с фиксированной точкой (ряд Тейлора)."""
+    total = term = one // x
+    x2 = x * x
+    k = 1
+    sign = -1
+    while term:
+        term //= x2
+        total += sign * (term // (2 * k + 1))
+        sign = -sign
+        k += 1
+    return total
+
+def _pi_fixed(bits: int) -> int:
+    """floor(π * 2^bits) по формуле Мэчина π = 16 arctg(1/5) - 4 arctg(1/239) (64 защитных бита)."""
+    one = 1 << (bits + 64)
+    return (16 * _arctan_inv(5, one) - 4 * _arctan_inv(239, one)) >> 64
+
+def _e_fixed(bits: int) -> int:
+    """floor(e * 2^bits) как сумма ряда 1/k! (64 защитных бита)."""
+    one = 1 << (bits + 64)
+    total, term, k = 0, one, 0
+    while term:
+        total += term
+        k += 1
+        term //= k
+    return total >> 64
+
+def modp_group_names() -> List[str]:
+    """Имена встроенных стандартных групп."""
+    return list(_MODP_GROUPS)
+
+@lru_cache(maxsize=None)
+def modp_group(name: str, verify: bool = False) -> Tuple[int, int]:
+    """
+    Параметры (p, g) стандартной группы по имени (см. modp_group_names): простое
+    вычисляется по формуле RFC при первом обращении и кешируется. verify=True
+    дополнительно проверяет, что p — безопасное простое (тест Миллера–Рабина для q).
+    """
+    if name not in _MODP_GROUPS:
+        raise ValueError(f"Неизвестная группа {name!r}; доступны: {', '.join(_MODP_GROUPS)}.")
+    n, constant, k = _MODP_GROUPS[name]
+    frac = _pi_fixed(n - 130) if constant == "pi" else _e_fixed(n - 130)
+    p = (1 << n) - (1 << (n - 64)) - 1 + (1 << 64) * (frac + k)
+    if verify and not (is_probable_prime((p - 1) // 2) and mod_pow(2, p - 1, p) == 1):
+        raise ValueError(f"Группа {name}: p не является безопасным простым.")
+    return p, 2
 
 def discrete_log_interactive():
     print("Решение дискретного логарифма y = a^x mod p.")
@@ -202,12 +784,163 @@ def discrete_log_interactive():
 # Лабораторная 3: Диффи-Хеллмана
 # -------------------------
 
-def prime_factors(n: int) -> List[int]:
-    """Возвращает список простых множителей n (без повторений)."""
+def _pollard_brent(n: int, c: int, max_iters: Optional[int] = None, batch: int = 128) -> Optional[int]:
+    """
+    ρ-метод Полларда в варианте Брента для составного нечётного n (x -> x^2 + c mod n).
+    Разности |x - y| накапливаются произведением, и gcd с n берётся раз в batch шагов;
+    если gcd оказался равен n, последний блок повторяется с gcd на каждом шаге.
+    Возвращает нетривиальный делитель либо None (неудачное c или исчерпан max_iters).
+    """
+    y, r, q, g = random.randrange(1, n), 1, 1, 1
+    iters = 0
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % n
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(batch, r - k)):
+                y = (y * y + c) % n
+                q = (q * abs(x - y)) % n
+            g = math.gcd(q, n)
+            k += batch
+        iters += r
+        r <<= 1
+        if max_iters is not None and iters >= max_iters and g == 1:
+            return None
+    if g == n:
+        while True:
+            ys = (ys * ys + c) % n
+            g = math.gcd(abs(x - ys), n)
+            if g > 1:
+                break
+    return g if g != n else None
+
+def _mont_ladder(k: int, x: int, z: int, a24: int, n: int) -> Tuple[int, int]:
+    """k * (x : z) на кривой Монтгомери B*y^2 = x^3 + A*x^2 + x над Z_n в координатах X:Z (a24 = (A+2)/4)."""
+    x1, z1 = x, z
+    t1, t2 = (x + z) ** 2 % n, (x - z) ** 2 % n
+    x2, z2 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+    for bit in bin(k)[3:]:
+        # (x1:z1) = m*P, (x2:z2) = (m+1)*P
+        u = (x1 - z1) * (x2 + z2) % n
+        v = (x1 + z1) * (x2 - z2) % n
+        xs, zs = z * (u + v) ** 2 % n, x * (u - v) ** 2 % n
+        if bit == "1":
+            t1, t2 = (x2 + z2) ** 2 % n, (x2 - z2) ** 2 % n
+            x1, z1 = xs, zs
+            x2, z2 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+        else:
+            t1, t2 = (x1 + z1) ** 2 % n, (x1 - z1) ** 2 % n
+            x2, z2 = xs, zs
+            x1, z1 = t1 * t2 % n, (t1 - t2) * (t2 + a24 * (t1 - t2)) % n
+    return x1, z1
+
+# Этапы ECM: (граница B1, число кривых); примерно оптимальны для делителей 15, 20, 25, 30 цифр
+_ECM_STAGES = ((2000, 25), (11000, 90), (50000, 300), (250000, 700))
+
+def _ecm(n: int) -> Optional[int]:
+    """
+    Метод эллиптических кривых Ленстры (первая стадия) на кривых Монтгомери с
+    параметризацией Суямы: точка умножается лестницей на все степени простых <= B1,
+    без обращений; gcd(Z, n) после умножения даёт делитель n, если порядок кривой
+    по модулю какого-то простого делителя B1-гладкий.
+    Возвращает нетривиальный делитель либо None, если этапы _ECM_STAGES исчерпаны.
+    """
+    for bound, curves in _ECM_STAGES:
+        prime_powers = []
+        for q in _sieve_primes(bound + 1):
+            qk = q
+            while qk * q <= bound:
+                qk *= q
+            prime_powers.append(qk)
+        for _ in range(curves):
+            sigma = random.randrange(6, n - 1)
+            u = (sigma * sigma - 5) % n
+            v = 4 * sigma % n
+            x, z = pow(u, 3, n), pow(v, 3, n)
+            den = 16 * pow(u, 3, n) * v % n
+            g = math.gcd(den, n)
+            if g != 1:
+                if g != n:
+                    return g
+                continue
+            a24 = pow(v - u, 3, n) * (3 * u + v) * pow(den, -1, n) % n
+            for qk in prime_powers:
+                x, z = _mont_ladder(qk, x, z, a24, n)
+            g = math.gcd(z, n)
+            if 1 < g < n:
+                return g
+    return None
+
+# Бюджет ρ-метода (итераций) перед переходом к ECM: делители до ~2^36 находятся ρ-методом
+_RHO_BUDGET = 1 << 18
+
+def _find_factor(n: int, ecm: bool = True) -> int:
+    """Нетривиальный делитель составного n: ρ-Брент с ограничением, затем ECM, затем ρ без ограничения."""
+    if n % 2 == 0:
+        return 2
+    r = math.isqrt(n)
+    if r * r == n:
+        return r
+    for c in (1, 3, 5, 7):
+        d = _pollard_brent(n, c, _RHO_BUDGET // 4)
+        if d:
+            return d
+    if ecm:
+        d = _ecm(n)
+        if d:
+            return d
+    c = 11
+    while True:
+        d = _pollard_brent(n, c)
+        if d:
+            return d
+        c += 2
+
+@lru_cache(maxsize=128)
+def factorize(n: int, ecm: bool = True) -> Tuple[Tuple[int, int], ...]:
+    """
+    Полное разложение n > 0: кортеж пар (простое, показатель) по возрастанию.
+    1) пробное деление на SMALL_PRIMES; 2) ρ-метод Полларда — Брента с пакетным gcd;
+    3) при ecm=True — метод эллиптических кривых для делителей, недоступных ρ-методу.
+    Простота множителей подтверждается тестом Миллера–Рабина. Недавние разложения
+    кешируются (lru_cache), так что повторные запросы для одного порядка группы бесплатны.
+    """
+    if n < 1:
+        raise ValueError("Разлагается только n >= 1.")
+    result: Dict[int, int] = {}
+    for q in SMALL_PRIMES:
+        if q * q > n:
+            break
+        while n % q == 0:
+            result[q] = result.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            result[m] = result.get(m, 0) + 1
+            continue
+        d = _find_factor(m, ecm)
+        stack.extend((d, m // d))
+    return tuple(sorted(result.items()))
+
+def prime_factors(n: int, limit: Optional[int] = None) -> List[int]:
+    """
+    Возвращает список простых множителей n (без повторений), см. factorize.
+    limit — только пробное деление до limit: если граница достигнута, остаток
+    добавляется последним элементом как есть и может оказаться составным.
+    """
+    if limit is None:
+        return [q for q, _ in factorize(n)]
     factors = []
     d = 2
     temp = n
     while d * d <= temp:
+        if d > limit:
+            break
         if temp % d == 0:
             factors.append(d)
             while temp % d == 0:
@@ -220,6 +953,8 @@ def prime_factors(n: int) -> List[int]:
 def find_primitive_root(p: int) -> Optional[int]:
     if p <= 2:
         return None
+    if p > 5 and is_probable_prime((p - 1) // 2):
+        return find_safe_prime_generator(p)
     phi = p - 1
     factors = prime_factors(phi)
     for g in range(2, p):
@@ -238,11 +973,18 @@ def diffie_hellman_shared_key_interactive():
     Доступны режимы:
     1) Ввод p, g, XA, XB с клавиатуры (g может быть не примитивным — в этом случае протокол всё равно сработает, но пространство ключей меньше).
     2) Генерация p (простое), поиск примитивного g и генерация приватных ключей XA, XB.
+    3) Генерация безопасного простого p = 2q + 1 заданной длины; g проверяется за O(1).
+    4) Стандартная группа RFC 3526 / RFC 7919 по имени (таблица степеней g кешируется на диске).
+    5) Подгруппа Шнорра: p = kq + 1, q — 256 бит, g порядка q, XA, XB < q (короткие показатели);
+       открытые ключи проверяются на принадлежность подгруппе.
     Возвращает общий ключ и печатает промежуточные значения.
     """
     print("Диффи-Хеллман: выберите режим задания параметров:")
     print("1) Ввести p, g, XA, XB с клавиатуры")
     print("2) Сгенерировать p (простое), найти g (примитивный корень), сгенерировать XA, XB")
+    print("3) Сгенерировать безопасное простое p = 2q + 1 заданной длины, g, XA, XB")
+    print("4) Стандартная группа (RFC 3526 / RFC 7919), сгенерировать XA, XB")
+    print("5) Подгруппа Шнорра p = kq + 1 (q — 256 бит), короткие XA, XB < q")
     choice = input("Ваш выбор: ").strip()
 
     if choice == "1":
@@ -268,6 +1010,36 @@ def diffie_hellman_shared_key_interactive():
         XvA = random.randint(2, p-2)
         XvB = random.randint(2, p-2)
         print(f"Сгенерированы приватные ключи: XA = {XvA}, XB = {XvB}")
+    elif choice == "3":
+        bits = int(input("Длина p в битах (например, 512 или 2048): ").strip())
+        workers = os.cpu_count() or 1
+        print(f"Поиск безопасного простого ({workers} процесс(ов))...")
+        p = generate_safe_prime(bits, workers)
+        print(f"Сгенерировано безопасное простое p = {p}")
+        g = find_safe_prime_generator(p)
+        print(f"Найден примитивный корень g = {g} (g^2 ≠ 1 и g^q ≠ 1 mod p)")
+        XvA = random.randint(2, p-2)
+        XvB = random.randint(2, p-2)
+        print(f"Сгенерированы приватные ключи: XA = {XvA}, XB = {XvB}")
+    elif choice == "4":
+        print("Доступные группы: " + ", ".join(modp_group_names()))
+        name = input("Имя группы (Enter — ffdhe2048): ").strip() or "ffdhe2048"
+        p, g = modp_group(name)
+        print(f"Группа {name}: p ({p.bit_length()} бит), g = {g}")
+        XvA = random.randint(2, p-2)
+        XvB = random.randint(2, p-2)
+        print(f"Сгенерированы приватные ключи: XA = {XvA}, XB = {XvB}")
+    elif choice == "5":
+        bits = int(input("Длина p в битах (например, 2048): ").strip())
+        workers = os.cpu_count() or 1
+        print(f"Поиск p = kq + 1 ({workers} процесс(ов))...")
+        p, q, g = generate_schnorr_group(bits, workers=workers)
+        print(f"q ({q.bit_length()} бит) = {q}")
+        print(f"p ({p.bit_length()} бит) = {p}")
+        print(f"Генератор подгруппы порядка q: g = {g}")
+        XvA = random.randint(2, q-1)
+        XvB = random.randint(2, q-1)
+        print(f"Сгенерированы приватные ключи: XA = {XvA}, XB = {XvB}")
     else:
         print("Неверный выбор.")
         return None
@@ -275,13 +1047,25 @@ def diffie_hellman_shared_key_interactive():
     if p <= 1:
         print("Модуль p должен быть > 1.")
         return None
-    if not is_probable_prime(p, k=8):
+    # простые стандартных групп известны, повторная проверка не нужна
+    if choice != "4" and not is_probable_prime(p):
         print("Внимание: p не прошёл проверку на простоту с высокой вероятностью.")
 
-    YA = mod_pow(g, XvA, p)
-    YB = mod_pow(g, XvB, p)
+    # Таблица степеней g окупается только примерно с 40 возведений на одно основание,
+    # поэтому она используется лишь для стандартной группы (загружается с диска);
+    # для нового p на сеанс нужны всего два возведения — обычный mod_pow.
+    if choice == "4":
+        g_table = cached_fixed_base_table(g, p)
+        YA = g_table.pow(XvA)
+        YB = g_table.pow(XvB)
+    else:
+        YA = mod_pow(g, XvA, p)
+        YB = mod_pow(g, XvB, p)
 
     print(f"Публичные ключи: YA = g^XA mod p = {YA}, YB = g^XB mod p = {YB}")
+    if choice == "5" and not (is_schnorr_subgroup_member(YA, p, q) and is_schnorr_subgroup_member(YB, p, q)):
+        print("ВНИМАНИЕ: открытый ключ не принадлежит подгруппе порядка q!")
+        return None
 
     K_A = mod_pow(YB, XvA, p)
     K_B = mod_pow(YA, XvB, p)
@@ -303,6 +1087,182 @@ def diffie_hellman_shared_key_interactive():
         "shared_key": shared_key
     }
 
+# -------------------------
+# Групповой ключ (TGDH)
+# -------------------------
+
+class GroupKeyTree:
+    """
+    Согласование общего ключа N участников по схеме TGDH (дерево Диффи-Хеллмана).
+
+    Участники — листья сбалансированного двоичного дерева. Ключ листа — секрет
+    участника, ключ внутреннего узла k_v = g^(k_l * k_r) mod p = BK_r^(k_l) = BK_l^(k_r),
+    где BK = g^k mod p — открытый («ослеплённый») ключ узла. Ключ корня — общий ключ группы.
+
+    Участник знает только свой секрет и открытые ключи соседей (sibling) на пути
+    к корню, поэтому вычисляет общий ключ за depth = ceil(log2 N) возведений
+    в степень (member_key), а не за O(N). Объект моделирует всю группу сразу:
+    хранит ключи всех узлов и считает выполненные возведения (exponentiations).
+    Смена секрета одного участника (rekey) пересчитывает только узлы на его пути.
+    """
+
+    def __init__(self, p: int, g: int, secrets: List[int]):
+        if len(secrets) < 2:
+            raise ValueError("В группе должно быть не менее двух участников.")
+        self.p = p
+        self.g = g % p
+        self.exponentiations = 0
+        self._g_table = fixed_base_table(g, p)
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.parent: List[int] = []
+        self.key: List[int] = []
+        self.blinded: List[int] = []
+        self.leaves: List[int] = []
+        self.root = self._build(secrets, 0, len(secrets), -1)
+        self.depth = max(self._path_length(leaf) for leaf in self.leaves)
+
+    def _new_node(self, parent: int) -> int:
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(parent)
+        self.key.append(0)
+        self.blinded.append(0)
+        return len(self.key) - 1
+
+    def _build(self, secrets: List[int], lo: int, hi: int, parent: int) -> int:
+        node = self._new_node(parent)
+        if hi - lo == 1:
+            self.key[node] = secrets[lo] % self.p
+            self.leaves.append(node)
+        else:
+            mid = (lo + hi + 1) // 2
+            self.left[node] = self._build(secrets, lo, mid, node)
+            self.right[node] = self._build(secrets, mid, hi, node)
+            self.key[node] = self._exp(self.blinded[self.right[node]], self.key[self.left[node]])
+        if parent != -1:
+            self.blinded[node] = self._blind(self.key[node])
+        return node
+
+    def _exp(self, base: int, x: int) -> int:
+        self.exponentiations += 1
+        return mod_pow(base, x, self.p)
+
+    def _blind(self, x: int) -> int:
+        self.exponentiations += 1
+        return self._g_table.pow(x)
+
+    def _leaf(self, i: int) -> int:
+        if not 0 <= i < len(self.leaves):
+            raise ValueError(f"Нет участника с индексом {i} (участников {len(self.leaves)}).")
+        return self.leaves[i]
+
+    def _sibling(self, node: int) -> int:
+        parent = self.parent[node]
+        return self.right[parent] if self.left[parent] == node else self.left[parent]
+
+    def _path_length(self, node: int) -> int:
+        length = 0
+        while self.parent[node] != -1:
+            node = self.parent[node]
+            length += 1
+        return length
+
+    @property
+    def group_key(self) -> int:
+        """Общий ключ группы (ключ корня дерева)."""
+        return self.key[self.root]
+
+    def member_key(self, i: int) -> int:
+        """
+        Общий ключ с точки зрения участника i: его секрет и открытые ключи соседей
+        на пути к корню, одно возведение в степень на уровень.
+        """
+        node = self._leaf(i)
+        k = self.key[node]
+        while self.parent[node] != -1:
+            k = self._exp(self.blinded[self._sibling(node)], k)
+            node = self.parent[node]
+        return k
+
+    def rekey(self, i: int, secret: int = None) -> int:
+        """
+        Заменяет секрет участника i (по умолчанию — случайный) и пересчитывает ключи
+        и открытые ключи только на пути от его листа к корню. Возвращает новый общий ключ.
+        """
+        if secret is None:
+            secret = random.randint(2, self.p - 2)
+        node = self._leaf(i)
+        self.key[node] = secret % self.p
+        while self.parent[node] != -1:
+            self.blinded[node] = self._blind(self.key[node])
+            sibling = self._sibling(node)
+            parent = self.parent[node]
+            self.key[parent] = self._exp(self.blinded[sibling], self.key[node])
+            node = parent
+        return self.group_key
+
+def benchmark_group_key(sizes: Iterable[int] = tuple(1 << k for k in range(1, 11)),
+                        group: str = "modp1024", rekeys: int = 8) -> Dict[int, Dict[str, float]]:
+    """
+    Стоимость TGDH для групп из N участников (по умолчанию N = 2, 4, ..., 1024) в стандартной
+    группе group: возведения в степень и время построения всего дерева (setup), число
+    возведений одного участника до общего ключа и среднее время/число возведений rekey.
+    """
+    p, g = modp_group(group)
+    results: Dict[int, Dict[str, float]] = {}
+    print(f"Группа {group} ({p.bit_length()} бит)")
+    print(f"{'N':>5} | {'глубина':>7} | {'setup, возв.':>12} | {'setup, с':>9} | "
+          f"{'участник':>8} | {'rekey, возв.':>12} | {'rekey, мс':>9}")
+    for n in sizes:
+        start = time.perf_counter()
+        tree = GroupKeyTree(p, g, [random.randint(2, p - 2) for _ in range(n)])
+        setup = time.perf_counter() - start
+        setup_exps = tree.exponentiations
+        tree.exponentiations = 0
+        member = random.randrange(n)
+        if tree.member_key(member) != tree.group_key:
+            raise RuntimeError(f"N = {n}: ключ участника {member} не совпал с ключом группы.")
+        member_exps = tree.exponentiations
+        tree.exponentiations = 0
+        start = time.perf_counter()
+        for _ in range(rekeys):
+            tree.rekey(random.randrange(n))
+        rekey_time = (time.perf_counter() - start) / rekeys
+        row = {"depth": tree.depth, "setup_exps": setup_exps, "setup_sec": setup, "member_exps": member_exps,
+               "rekey_exps": tree.exponentiations / rekeys, "rekey_sec": rekey_time}
+        results[n] = row
+        print(f"{n:>5} | {tree.depth:>7} | {setup_exps:>12} | {setup:>9.3f} | "
+              f"{member_exps:>8} | {row['rekey_exps']:>12.1f} | {rekey_time * 1000:>9.2f}")
+    return results
+
+def group_key_interactive():
+    """Общий ключ N участников (TGDH) в стандартной группе и смена ключа одного участника."""
+    print("Доступные группы: " + ", ".join(modp_group_names()))
+    name = input("Имя группы (Enter — modp1024): ").strip() or "modp1024"
+    p, g = modp_group(name)
+    n = int(input("Число участников N: ").strip())
+    start = time.perf_counter()
+    tree = GroupKeyTree(p, g, [random.randint(2, p - 2) for _ in range(n)])
+    elapsed = time.perf_counter() - start
+    print(f"Дерево глубины {tree.depth} построено за {elapsed:.3f} с ({tree.exponentiations} возведений в степень).")
+    print(f"Общий ключ группы = {tree.group_key}")
+    tree.exponentiations = 0
+    if tree.member_key(0) != tree.group_key:
+        print("ВНИМАНИЕ: ключ участника 1 не совпал с ключом группы!")
+        return None
+    print(f"Участник 1 получает тот же ключ за {tree.exponentiations} возведений в степень.")
+    member = input(f"Сменить секрет участника (1..{n}, Enter — пропустить): ").strip()
+    if member:
+        member = int(member)
+        if not 1 <= member <= n:
+            print(f"Номер участника должен быть от 1 до {n}.")
+            return tree.group_key
+        tree.exponentiations = 0
+        key = tree.rekey(member - 1)
+        print(f"Новый общий ключ = {key} ({tree.exponentiations} возведений в степень).")
+    return tree.group_key
+
 # -------------------------
 # Menu
 # -------------------------
@@ -317,6 +1277,8 @@ def main():
         print("5) Обобщённый алгоритм Евклида (НОД + x, y)")
         print("6) Дискретный логарифм (метод 'шаг младенца — шаг великана')")
         print("7) Диффи-Хеллман — построение общего ключа")
+        print("8) Групповой ключ N участников (TGDH)")
+        print("9) Сравнение стоимости TGDH для N = 2..1024")
         print("0) Выход")
         choice = input("Ваш выбор: ").strip()
 
@@ -342,8 +1304,8 @@ def main():
         elif choice == "3":
             try:
                 n = int(input("Введите n: "))
-                k = int(input("Введите количество итераций теста (например 5): "))
-                res = is_probable_prime(n, k)
+                k_str = input("Количество итераций теста (Enter — по длине n): ").strip()
+                res = is_probable_prime(n, int(k_str) if k_str else None)
                 print("Вероятно простое" if res else "Составное")
             except ValueError as e:
                 print("Ошибка:", e)
@@ -377,6 +1339,15 @@ def main():
             except ValueError as e:
                 print("Ошибка:", e)
 
+        elif choice == "8":
+            try:
+                group_key_interactive()
+            except ValueError as e:
+                print("Ошибка:", e)
+
+        elif choice == "9":
+            benchmark_group_key()
+
         elif choice == "0":
             print("Выход.")
             break
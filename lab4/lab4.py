@@ -1,13 +1,22 @@
+import mmap
 import random
+import struct
+import weakref
 from math import gcd
 
 def mod_inverse(a, m):
     """Находим обратный элемент к a по модулю m."""
     def egcd(x, y):
-        if x == 0:
-            return (y, 0, 1)
-        g, b, d = egcd(y % x, x)
-        return (g, d - (y // x) * b, b)
+        # итеративный алгоритм Евклида: r = x*s + y*t на каждом шаге
+        r0, r1 = y, x
+        s0, s1 = 0, 1
+        t0, t1 = 1, 0
+        while r1:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            s0, s1 = s1, s0 - q * s1
+            t0, t1 = t1, t0 - q * t1
+        return (r0, s0, t0)
 
     g, x, _ = egcd(a, m)
     if g != 1:
@@ -22,6 +31,45 @@ def is_prime(n):
             return False
     return True
 
+SMALL_PRIMES = [q for q in range(2, 2000) if is_prime(q)]
+
+def is_probable_prime(n, k=40):
+    """Тест Миллера–Рабина (k раундов) с предварительным делением на малые простые."""
+    if n < 2:
+        return False
+    for q in SMALL_PRIMES:
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(k):
+        x = pow(random.randrange(2, n - 1), d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def generate_prime(bits):
+    """Случайное вероятно простое длиной ровно bits бит."""
+    while True:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_probable_prime(n):
+            return n
+
+def generate_keys(p):
+    """Пара ключей абонента: C, взаимно простое с p - 1, и D = C^-1 mod (p - 1)."""
+    while True:
+        C = random.randint(2, p - 2)
+        if gcd(C, p - 1) == 1:
+            return C, mod_inverse(C, p - 1)
+
 def generate_params():
     """Генерация параметров p, CvA, CvB, DvA, DvB."""
     while True:
@@ -29,18 +77,21 @@ def generate_params():
         if is_prime(p):
             break
 
-    while True:
-        CvA = random.randint(2, p - 2)
-        if gcd(CvA, p - 1) == 1:
-            break
-    DvA = mod_inverse(CvA, p - 1)
+    CvA, DvA = generate_keys(p)
+    CvB, DvB = generate_keys(p)
 
-    while True:
-        CvB = random.randint(2, p - 2)
-        if gcd(CvB, p - 1) == 1:
-            break
-    DvB = mod_inverse(CvB, p - 1)
+    return p, CvA, CvB, DvA, DvB
 
+# Минимальная длина p для блочного режима
+BLOCK_MIN_BITS = 1024
+
+def generate_block_params(bits=BLOCK_MIN_BITS):
+    """Параметры p, CvA, CvB, DvA, DvB блочного режима: простое p длиной bits >= BLOCK_MIN_BITS бит."""
+    if bits < BLOCK_MIN_BITS:
+        raise ValueError(f"Для блочного режима p должно быть не короче {BLOCK_MIN_BITS} бит")
+    p = generate_prime(bits)
+    CvA, DvA = generate_keys(p)
+    CvB, DvB = generate_keys(p)
     return p, CvA, CvB, DvA, DvB
 
 def shamir_encrypt_file(input_file, output_file, p, CvA, CvB):
@@ -53,36 +104,213 @@ def shamir_encrypt_file(input_file, output_file, p, CvA, CvB):
         c2 = pow(c1, CvB, p)
         encrypted.append(c2)
 
-    with open(output_file, "w") as f:
-        f.write(" ".join(map(str, encrypted)))
+    write_container(output_file, encrypted, p, MODE_BYTES)
 
 def shamir_decrypt_file(input_file, output_file, p, DvA, DvB):
-    with open(input_file, "r") as f:
-        encrypted = list(map(int, f.read().split()))
-
     decrypted = []
-    for c in encrypted:
-        m1 = pow(c, DvB, p)
-        m2 = pow(m1, DvA, p)
-        decrypted.append(m2)
+    with ContainerReader(input_file, p, MODE_BYTES) as encrypted:
+        for c in encrypted:
+            m1 = pow(c, DvB, p)
+            m2 = pow(m1, DvA, p)
+            decrypted.append(m2)
 
     with open(output_file, "wb") as f:
         f.write(bytes(decrypted))
 
+# -------------------------------
+# Блочный режим
+# -------------------------------
+
+def block_data_size(p):
+    """
+    Число байт данных в блоке. Блок — число 0x01 || данные (big-endian), где
+    всего (bits(p) - 1) // 8 байт, поэтому блок всегда меньше p.
+    """
+    return (p.bit_length() - 1) // 8 - 1
+
+def pack_blocks(data, p):
+    """
+    Разбивает данные на блоки-числа меньше p. Ведущий байт 0x01 сохраняет длину
+    каждого блока, в том числе неполного последнего и блоков из нулевых байт,
+    и исключает неподвижные точки m = 0 и m = 1.
+    """
+    size = block_data_size(p)
+    if size < 1:
+        raise ValueError("p слишком мало для блочного режима")
+    return [int.from_bytes(b"\x01" + data[i:i + size], "big") for i in range(0, len(data), size)]
+
+def unpack_blocks(blocks):
+    """Обратное к pack_blocks: отбрасывает ведущий байт 0x01 каждого блока."""
+    out = bytearray()
+    for m in blocks:
+        chunk = m.to_bytes((m.bit_length() + 7) // 8, "big")
+        if not chunk or chunk[0] != 1:
+            raise ValueError("Повреждённый блок: нет маркера 0x01")
+        out += chunk[1:]
+    return bytes(out)
+
+def shamir_encrypt_file_blocks(input_file, output_file, p, CvA, CvB):
+    """Как shamir_encrypt_file, но два возведения в степень на блок из block_data_size(p) байт."""
+    with open(input_file, "rb") as f:
+        data = f.read()
+
+    encrypted = [pow(pow(m, CvA, p), CvB, p) for m in pack_blocks(data, p)]
+
+    write_container(output_file, encrypted, p, MODE_BLOCKS)
+
+def shamir_decrypt_file_blocks(input_file, output_file, p, DvA, DvB):
+    with ContainerReader(input_file, p, MODE_BLOCKS) as encrypted:
+        decrypted = [pow(pow(c, DvB, p), DvA, p) for c in encrypted]
+
+    with open(output_file, "wb") as f:
+        f.write(unpack_blocks(decrypted))
+
+# -------------------------------
+# Двоичный контейнер шифротекста
+# -------------------------------
+
+# Заголовок (big-endian): сигнатура, версия, режим, ширина блока в байтах
+# (длина p в байтах), байт данных в блоке, число блоков; затем count блоков
+# по width байт big-endian.
+CONTAINER_MAGIC = b"SHMR"
+CONTAINER_VERSION = 1
+CONTAINER_HEADER = struct.Struct(">4sBBHHQ")
+MODE_BYTES = 0
+MODE_BLOCKS = 1
+# Короткие блоки (побайтовый режим) читаются struct.iter_unpack без цикла по срезам
+_STRUCT_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+# Сколько байт блоков копируется из mmap за одно обращение при итерации
+_READ_CHUNK = 1 << 16
+
+def _block_width(p):
+    return (p.bit_length() + 7) // 8
+
+def write_container(output_file, blocks, p, mode):
+    """Записывает шифротекст (числа меньше p) в двоичный контейнер."""
+    width = _block_width(p)
+    block_size = block_data_size(p) if mode == MODE_BLOCKS else 1
+    with open(output_file, "wb") as f:
+        f.write(CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, mode, width, block_size, len(blocks)))
+        f.write(b"".join(c.to_bytes(width, "big") for c in blocks))
+
+class ContainerReader:
+    """
+    Чтение контейнера через mmap: заголовок проверяется при открытии, блоки
+    декодируются в числа по одному при обращении (reader[i] или итерация).
+    Если заданы p и mode, они сверяются с заголовком.
+
+    Блоки читаются копиями срезов mmap (до _READ_CHUNK байт за раз), поэтому
+    на буфер не остаётся ссылок и close() можно вызвать в любой момент, в том
+    числе при незаконченной итерации; открытые итераторы при этом завершаются.
+    """
+
+    def __init__(self, path, p=None, mode=None):
+        with open(path, "rb") as f:
+            header = f.read(CONTAINER_HEADER.size)
+            if len(header) < CONTAINER_HEADER.size:
+                raise ValueError(f"Файл {path} слишком короткий для контейнера")
+            magic, version, self.mode, self.width, self.block_size, self.count = CONTAINER_HEADER.unpack(header)
+            if magic != CONTAINER_MAGIC:
+                raise ValueError(f"Файл {path} не является двоичным контейнером "
+                                 "(старый текстовый формат преобразуется convert_text_ciphertext)")
+            if version != CONTAINER_VERSION:
+                raise ValueError(f"Неподдерживаемая версия контейнера: {version}")
+            if f.seek(0, 2) != CONTAINER_HEADER.size + self.count * self.width:
+                raise ValueError(f"Файл {path} повреждён: размер не совпадает с заголовком")
+            if p is not None and self.width != _block_width(p):
+                raise ValueError("Файл зашифрован с другим p")
+            if mode is not None and self.mode != mode:
+                raise ValueError("Файл зашифрован в другом режиме (побайтовый/блочный)")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._iterators = weakref.WeakSet()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = CONTAINER_HEADER.size + i * self.width
+        return int.from_bytes(self._mm[start:start + self.width], "big")
+
+    def __iter__(self):
+        it = self._blocks()
+        self._iterators.add(it)
+        return it
+
+    def _blocks(self):
+        width = self.width
+        code = _STRUCT_CODES.get(width)
+        step = max(1, _READ_CHUNK // width) * width
+        end = CONTAINER_HEADER.size + self.count * width
+        for start in range(CONTAINER_HEADER.size, end, step):
+            chunk = self._mm[start:min(start + step, end)]
+            if code:
+                for (c,) in struct.iter_unpack(">" + code, chunk):
+                    yield c
+            else:
+                for off in range(0, len(chunk), width):
+                    yield int.from_bytes(chunk[off:off + width], "big")
+
+    def close(self):
+        for it in list(self._iterators):
+            it.close()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def convert_text_ciphertext(input_file, output_file, p, block_mode):
+    """Преобразует шифротекст старого формата (числа через пробел) в двоичный контейнер."""
+    with open(input_file, "r") as f:
+        encrypted = list(map(int, f.read().split()))
+    if any(not 0 <= c < p for c in encrypted):
+        raise ValueError("В файле есть числа вне диапазона [0, p)")
+    write_container(output_file, encrypted, p, MODE_BLOCKS if block_mode else MODE_BYTES)
+    return len(encrypted)
+
 if __name__ == "__main__":
+    mode = input("Режим: 1 - побайтовый (малое p), 2 - блочный (p >= 1024 бит), "
+                 "3 - преобразовать текстовый шифротекст в контейнер: ").strip()
+    if mode == '3':
+        p = int(input("Введите p: "))
+        block_mode = input("Файл зашифрован в блочном режиме? (y/n): ").strip().lower() == 'y'
+        source = input("Текстовый файл (Enter - encrypted.txt): ").strip() or "encrypted.txt"
+        count = convert_text_ciphertext(source, "encrypted.bin", p, block_mode)
+        print(f"Готово! {count} блоков записано в encrypted.bin")
+        raise SystemExit
+    block_mode = mode == '2'
+
     choice = input("Хотите ввести параметры вручную? (y/n): ").strip().lower()
 
     if choice == 'y':
         p = int(input("Введите p (простое число): "))
+        if block_mode:
+            if p.bit_length() < BLOCK_MIN_BITS:
+                raise ValueError(f"Для блочного режима p должно быть не короче {BLOCK_MIN_BITS} бит")
+            if not is_probable_prime(p):
+                raise ValueError("p не является простым")
         CvA = int(input("Введите CA: "))
         CvB = int(input("Введите CB: "))
         DvA = mod_inverse(CvA, p - 1)
         DvB = mod_inverse(CvB, p - 1)
+    elif block_mode:
+        bits = int(input(f"Длина p в битах (Enter - {BLOCK_MIN_BITS}): ").strip() or BLOCK_MIN_BITS)
+        p, CvA, CvB, DvA, DvB = generate_block_params(bits)
+        print(f"Сгенерированные параметры ({p.bit_length()} бит, {block_data_size(p)} байт в блоке):\n"
+              f"p={p}, CA={CvA}, CB={CvB}, DA={DvA}, DB={DvB}")
     else:
         p, CvA, CvB, DvA, DvB = generate_params()
         print(f"Сгенерированные параметры:\np={p}, CA={CvA}, CB={CvB}, DA={DvA}, DB={DvB}")
 
-    shamir_encrypt_file("input.bin", "encrypted.txt", p, CvA, CvB)
-    shamir_decrypt_file("encrypted.txt", "output.bin", p, DvA, DvB)
+    if block_mode:
+        shamir_encrypt_file_blocks("input.bin", "encrypted.bin", p, CvA, CvB)
+        shamir_decrypt_file_blocks("encrypted.bin", "output.bin", p, DvA, DvB)
+    else:
+        shamir_encrypt_file("input.bin", "encrypted.bin", p, CvA, CvB)
+        shamir_decrypt_file("encrypted.bin", "output.bin", p, DvA, DvB)
 
-    print("Готово! Файл зашифрован -> encrypted.txt и расшифрован -> output.bin")
+    print("Готово! Файл зашифрован -> encrypted.bin и расшифрован -> output.bin")
@@ -1,5 +1,8 @@
+import os
+import queue
 import struct
 import sys
+from multiprocessing import Pool
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 from Crypto.Util import number
@@ -7,15 +10,49 @@ from Crypto.Util.number import bytes_to_long, long_to_bytes, inverse
 
 MAGIC = b'ELGAMALHY'
 
-def generate_elgamal_params(key_size_bits=2048):
+def _first_result(task, args, workers=None):
+    """
+    Запускает task(*args) в пуле процессов, пока одно из заданий не вернёт не None.
+    После первого успеха пул завершается (terminate), остальные задания отменяются.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = queue.Queue()
+    with Pool(workers) as pool:
+        def submit():
+            pool.apply_async(task, args, callback=results.put, error_callback=results.put)
+        for _ in range(2 * workers):
+            submit()
+        while True:
+            r = results.get()
+            if isinstance(r, BaseException):
+                raise r
+            if r is not None:
+                return r
+            submit()
+
+def _strong_prime_task(key_size_bits):
+    """Одна независимая попытка getStrongPrime (в отдельном процессе)."""
+    return number.getStrongPrime(key_size_bits)
+
+# Пул процессов окупается, только если последовательный поиск заметно дольше его
+# запуска и остановки (15-60 мс): по benchmark_parallel_keygen (Лаб.8) — с 768 бит.
+# На одноядерной машине (workers = cpu_count() = 1) поиск всегда последовательный.
+PARALLEL_MIN_BITS = 768
+
+def generate_elgamal_params(key_size_bits=2048, workers=1):
     """
     Генерирует параметры ElGamal:
     p — большое простое число
     g — генератор
     x — приватный ключ (DvB)
     y — публичный ключ (CvB) = g^x mod p
+    При workers > 1 и p от PARALLEL_MIN_BITS бит p ищется параллельно в нескольких процессах
+    (берётся первый результат).
     """
-    p = number.getStrongPrime(key_size_bits)
+    if workers > 1 and key_size_bits >= PARALLEL_MIN_BITS:
+        p = _first_result(_strong_prime_task, (key_size_bits,), workers)
+    else:
+        p = number.getStrongPrime(key_size_bits)
     g = number.getRandomRange(2, p-1)
     x = number.getRandomRange(2, p-2)
     y = pow(g, x, p)
@@ -68,7 +105,7 @@ def unpack_length_prefixed_int(f):
 # -----------------------------------------
 # Основные функции: шифрование и расшифровка файла
 # -----------------------------------------
-def encrypt_file(input_path, output_path, p=None, g=None, y=None, key_size_bits=2048):
+def encrypt_file(input_path, output_path, p=None, g=None, y=None, key_size_bits=2048, workers=1):
     """
     Шифрует файл.
     - Если p,g,y заданы, они используются.
@@ -78,7 +115,7 @@ def encrypt_file(input_path, output_path, p=None, g=None, y=None, key_size_bits=
         (None, p, g, y) если ключи были переданы вручную.
     """
     if p is None or g is None or y is None:
-        p, g, y, x = generate_elgamal_params(key_size_bits)
+        p, g, y, x = generate_elgamal_params(key_size_bits, workers)
         generated = True
     else:
         x = None
@@ -98,7 +135,7 @@ def encrypt_file(input_path, output_path, p=None, g=None, y=None, key_size_bits=
     if m_int >= p:
         if generated:
             new_bits = max(key_size_bits, m_int.bit_length() + 64)
-            p, g, y, x = generate_elgamal_params(new_bits)
+            p, g, y, x = generate_elgamal_params(new_bits, workers)
         else:
             raise ValueError("Заданный p слишком мал для хранения AES ключа.")
 
@@ -187,7 +224,7 @@ def main():
         else:
             # Генерируем новые параметры
             bits = int(input("Размер простого p в битах [2048]: ").strip() or "2048")
-            x, p, g, y = encrypt_file(inpath, outpath, key_size_bits=bits)
+            x, p, g, y = encrypt_file(inpath, outpath, key_size_bits=bits, workers=os.cpu_count() or 1)
             print("Файл зашифрован и сохранён в:", outpath)
             print("Сгенерированы ключи:")
             print("p (бит) =", p.bit_length())
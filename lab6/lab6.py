@@ -1,23 +1,45 @@
 import random
-from math import gcd
+import secrets
+from math import gcd, prod
+from multiprocessing import Pool
 from pathlib import Path
 import json
 import os
+import queue
+
+
+def _sieve_primes(limit):
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+
+# Первые 2048 простых: отсев кандидата одним gcd с их произведением
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = prod(SMALL_PRIMES)
+# Основания 2..41 дают точный ответ Миллера–Рабина для n < MR_DETERMINISTIC_LIMIT
+MR_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
 
 
 def is_prime(n):
     if n < 2:
         return False
-    for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]:
-        if n % p == 0:
-            return n == p
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if gcd(n, _PRIMORIAL) != 1:
+        return False
     d, s = n - 1, 0
     while d % 2 == 0:
         d //= 2
         s += 1
-    for a in [2, 3, 5, 7, 11]:
-        if a >= n:
-            continue
+    bases = MR_DETERMINISTIC_BASES if n < MR_DETERMINISTIC_LIMIT else [2, 3, 5, 7, 11]
+    for a in bases:
         x = pow(a, d, n)
         if x in (1, n - 1):
             continue
@@ -37,21 +59,73 @@ def generate_prime(bits=16):
             return p
 
 
+def _prime_search_task(bits, batch):
+    """
+    Проверяет batch кандидатов из криптостойкого генератора (secrets): простые
+    становятся ключами RSA/Эль-Гамаля; возвращает простое или None.
+    """
+    for _ in range(batch):
+        p = secrets.randbits(bits)
+        if is_prime(p):
+            return p
+    return None
+
+
+def generate_primes_parallel(bits, count=1, workers=None, batch=16):
+    """
+    Ищет count различных простых в пуле процессов.
+    Каждое задание проверяет batch случайных кандидатов (secrets.randbits),
+    в работе держится 2 * workers заданий. Как только найдено count простых,
+    пул завершается (terminate), оставшиеся задания отменяются.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = queue.Queue()
+    found = []
+    with Pool(workers) as pool:
+        def submit():
+            pool.apply_async(_prime_search_task, (bits, batch),
+                             callback=results.put, error_callback=results.put)
+        for _ in range(2 * workers):
+            submit()
+        while len(found) < count:
+            p = results.get()
+            if isinstance(p, BaseException):
+                raise p
+            if p is not None and p not in found:
+                found.append(p)
+            submit()
+    return found
+
+
 def modinv(a, m):
     def egcd(a, b):
-        if a == 0:
-            return (b, 0, 1)
-        g, y, x = egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+        # итеративный алгоритм Евклида: r = a*x + b*y на каждом шаге
+        r0, r1 = b, a
+        x0, x1 = 0, 1
+        y0, y1 = 1, 0
+        while r1:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+        return (r0, x0, y0)
     g, x, _ = egcd(a, m)
     if g != 1:
         raise Exception('Обратный элемент не существует')
     return x % m
 
 
-def generate_keys(bits=16):
-    p = generate_prime(bits)
-    q = generate_prime(bits)
+# Пул процессов окупается, только если последовательный поиск заметно дольше его
+# запуска и остановки (15-60 мс): по benchmark_parallel_keygen (Лаб.8) — с 768 бит.
+# На одноядерной машине (workers = cpu_count() = 1) поиск всегда последовательный.
+PARALLEL_MIN_BITS = 768
+
+def generate_keys(bits=16, workers=1):
+    if workers > 1 and bits >= PARALLEL_MIN_BITS:
+        p, q = generate_primes_parallel(bits, 2, workers)
+    else:
+        p = generate_prime(bits)
+        q = generate_prime(bits)
     n = p * q
     phi = (p - 1) * (q - 1)
     e = 65537
@@ -60,12 +134,18 @@ def generate_keys(bits=16):
         while gcd(e, phi) != 1:
             e = random.randrange(3, phi, 2)
     d = modinv(e, phi)
-    return {'p': p, 'q': q, 'n': n, 'e': e, 'd': d}
+    keys = {'p': p, 'q': q, 'n': n, 'e': e, 'd': d}
+    if p != q and e <= CRT_MAX_E:
+        keys.update(crt_components(p, q, d))
+    return keys
 
 
 def save_keypair(keys):
     public = {'n': keys['n'], 'e': keys['e']}
     private = {'n': keys['n'], 'd': keys['d']}
+    if 'qInv' in keys:
+        for name in ('e', 'p', 'q', 'dP', 'dQ', 'qInv'):
+            private[name] = keys[name]
     with open("public_key.txt", "w") as f:
         json.dump(public, f, indent=4)
     with open("private_key.txt", "w") as f:
@@ -78,9 +158,62 @@ def load_key(filename):
         return json.load(f)
 
 
+def batch_pow(values, e, n):
+    """[v^e mod n for v in values]; одинаковые значения возводятся в степень один раз."""
+    cache = {}
+    result = []
+    for v in values:
+        r = cache.get(v)
+        if r is None:
+            r = cache[v] = pow(v, e, n)
+        result.append(r)
+    return result
+
+
+# КТО выгоден, только пока проверка m^e mod n дешёвая: при e порядка n (ключ из p, q, d
+# в режиме 1 или случайное e, когда 65537 не подошло) она стоит как само pow(c, d, n).
+CRT_MAX_E = 1 << 17
+
+
+def crt_components(p, q, d):
+    """CRT-компоненты закрытого ключа: dP = d mod (p-1), dQ = d mod (q-1), qInv = q^-1 mod p."""
+    return {'p': p, 'q': q, 'dP': d % (p - 1), 'dQ': d % (q - 1), 'qInv': modinv(q, p)}
+
+
+def rsa_crt_pow(c, key):
+    """
+    c^d mod n по КТО: два возведения по модулям p и q с половинными показателями
+    и рекомбинация Гарнера. Перед выдачей результат проверяется (m^e mod n == c),
+    чтобы сбой в вычислениях не раскрыл p или q.
+    """
+    p, q = key['p'], key['q']
+    m1 = pow(c, key['dP'], p)
+    m2 = pow(c, key['dQ'], q)
+    h = (key['qInv'] * (m1 - m2)) % p
+    m = m2 + h * q
+    n = p * q
+    if pow(m, key['e'], n) != c % n:
+        raise ValueError("Ошибка вычисления по КТО: результат не прошёл проверку")
+    return m
+
+
+def rsa_private_batch(values, n, d, crt=None):
+    """Операция закрытого ключа для списка значений (по КТО, если заданы компоненты crt)."""
+    if crt is None:
+        return batch_pow(values, d, n)
+    cache = {}
+    result = []
+    for v in values:
+        r = cache.get(v)
+        if r is None:
+            r = cache[v] = rsa_crt_pow(v, crt)
+        result.append(r)
+    return result
+
+
 def rsa_encrypt_file(input_file, output_file, n, e):
     data = Path(input_file).read_bytes()
-    encrypted = [pow(b, e, n) for b in data]
+    encrypted = batch_pow(data, e, n)
     with open(output_file, 'w') as f:
         f.write(' '.join(map(str, encrypted)))
     print(f"\nФайл зашифрован: {output_file}")
@@ -88,10 +221,10 @@ def rsa_encrypt_file(input_file, output_file, n, e):
     print(f"Размер зашифрованного: {os.path.getsize(output_file)} байт\n")
 
 
-def rsa_decrypt_file(input_file, output_file, n, d):
+def rsa_decrypt_file(input_file, output_file, n, d, crt=None):
     with open(input_file, 'r') as f:
         encrypted = list(map(int, f.read().split()))
-    decrypted = bytes([pow(c, d, n) % 256 for c in encrypted])
+    decrypted = bytes([m % 256 for m in rsa_private_batch(encrypted, n, d, crt)])
     Path(output_file).write_bytes(decrypted)
     print(f"\nФайл расшифрован: {output_file}")
     print(f"Размер расшифрованного файла: {os.path.getsize(output_file)} байт\n")
@@ -114,11 +247,13 @@ def main():
         phi = (p - 1) * (q - 1)
         e = modinv(d, phi)
         keys = {'p': p, 'q': q, 'n': n, 'e': e, 'd': d}
+        if p != q and e <= CRT_MAX_E:
+            keys.update(crt_components(p, q, d))
         save_keypair(keys)
 
     elif mode == '2':
         bits = int(input("Введите длину ключа (например 16, 32, 64): "))
-        keys = generate_keys(bits)
+        keys = generate_keys(bits, workers=os.cpu_count() or 1)
         print(f"\nСгенерированные значения:\n"
               f"p={keys['p']}\nq={keys['q']}\nn={keys['n']}\n"
               f"e={keys['e']}\nd={keys['d']}\n")
@@ -148,7 +283,12 @@ def main():
     if action == 'e':
         rsa_encrypt_file(input_file, output_file, keys['n'], keys['e'])
     elif action == 'd':
-        rsa_decrypt_file(input_file, output_file, keys['n'], keys['d'])
+        crt = keys if 'qInv' in keys and keys.get('e', CRT_MAX_E + 1) <= CRT_MAX_E else None
+        try:
+            rsa_decrypt_file(input_file, output_file, keys['n'], keys['d'], crt)
+        except ValueError as e:
+            # сбой проверки КТО: ключ не соответствует шифротексту или повреждён
+            print(f"Не удалось расшифровать файл: {e}")
     else:
         print("Неизвестное действие!")
 
@@ -1,5 +1,6 @@
 import os
 import secrets
+from functools import lru_cache
 
 # -------------------------------
 # Функции для шифра Вернама
@@ -21,6 +22,67 @@ def vernam_encrypt_decrypt(input_file, output_file, key):
 # Диффи-Хеллман для генерации ключа
 # -------------------------------
 
+# Стандартные группы RFC 3526 (MODP, константа π) и RFC 7919 (FFDHE, константа e), g = 2:
+# p = 2^n - 2^(n-64) - 1 + 2^64 * (floor(2^(n-130) * c) + k).
+# Таблица совпадает с _MODP_GROUPS из Лаб.3.
+_MODP_GROUPS = {
+    "modp1024": (1024, "pi", 129093),
+    "modp1536": (1536, "pi", 741804),
+    "modp2048": (2048, "pi", 124476),
+    "modp3072": (3072, "pi", 1690314),
+    "modp4096": (4096, "pi", 240904),
+    "modp6144": (6144, "pi", 929484),
+    "modp8192": (8192, "pi", 4743158),
+    "ffdhe2048": (2048, "e", 560316),
+    "ffdhe3072": (3072, "e", 2625351),
+    "ffdhe4096": (4096, "e", 5736041),
+    "ffdhe6144": (6144, "e", 15705020),
+    "ffdhe8192": (8192, "e", 10965728),
+}
+
+# Прежняя 32-битная группа лабораторной (только для демонстрации).
+LEGACY_GROUP = "legacy32"
+
+def modp_group_names():
+    """Имена доступных групп: прежняя 32-битная и стандартные."""
+    return [LEGACY_GROUP] + list(_MODP_GROUPS)
+
+def _arctan_inv(x, one):
+    """arctg(1/x) * one в целочисленной арифметике с фиксированной точкой."""
+    total = term = one // x
+    x2 = x * x
+    k = 1
+    sign = -1
+    while term:
+        term //= x2
+        total += sign * (term // (2 * k + 1))
+        sign = -sign
+        k += 1
+    return total
+
+def _constant_fixed(constant, bits):
+    """floor(c * 2^bits) для c = π (формула Мэчина) или c = e (ряд 1/k!), 64 защитных бита."""
+    one = 1 << (bits + 64)
+    if constant == "pi":
+        return (16 * _arctan_inv(5, one) - 4 * _arctan_inv(239, one)) >> 64
+    total, term, k = 0, one, 0
+    while term:
+        total += term
+        k += 1
+        term //= k
+    return total >> 64
+
+@lru_cache(maxsize=None)
+def modp_group(name):
+    """Параметры (p, g) группы по имени; простое вычисляется при первом обращении."""
+    if name == LEGACY_GROUP:
+        return 0xFFFFFFFB, 5
+    if name not in _MODP_GROUPS:
+        raise ValueError(f"Неизвестная группа {name!r}")
+    n, constant, k = _MODP_GROUPS[name]
+    p = (1 << n) - (1 << (n - 64)) - 1 + (1 << 64) * (_constant_fixed(constant, n - 130) + k)
+    return p, 2
+
 def diffie_hellman_key(p, g):
     a = secrets.randbelow(p-2) + 1
     b = secrets.randbelow(p-2) + 1
@@ -62,8 +124,13 @@ def main():
             return
     elif key_choice == '2':
         if action == '1':
-            p = 0xFFFFFFFB
-            g = 5
+            print("Группы: " + ", ".join(modp_group_names()))
+            group = input("Группа Диффи-Хеллмана (Enter — ffdhe2048): ").strip() or "ffdhe2048"
+            try:
+                p, g = modp_group(group)
+            except ValueError as e:
+                print("Ошибка:", e)
+                return
             key = diffie_hellman_key(p, g)
             print(f"Сгенерированный ключ (Diffie-Hellman): {key}")
             with open(key_file, "w") as kf:
@@ -1,6 +1,11 @@
 import hashlib
 import random
+import secrets
 import os
+import queue
+import time
+from math import prod
+from multiprocessing import Pool
 
 # =========================
 # RSA функции
@@ -17,24 +22,51 @@ def modinv(a, m):
     return x % m
 
 def extended_gcd(a, b):
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = extended_gcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    # итеративный алгоритм Евклида: r = a*x + b*y на каждом шаге
+    r0, r1 = b, a
+    x0, x1 = 0, 1
+    y0, y1 = 1, 0
+    while r1:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return (r0, x0, y0)
+
+def _sieve_primes(limit):
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Первые 2048 простых: отсев кандидата одним gcd с их произведением
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = prod(SMALL_PRIMES)
+# Основания 2..41 дают точный ответ Миллера–Рабина для n < MR_DETERMINISTIC_LIMIT
+MR_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
 
 def is_prime(n, k=5):
-    if n <= 1:
+    if n < 2:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if gcd(n, _PRIMORIAL) != 1:
         return False
-    if n <= 3:
-        return True
     d = n - 1
     r = 0
     while d % 2 == 0:
         d //= 2
         r += 1
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
+    if n < MR_DETERMINISTIC_LIMIT:
+        bases = MR_DETERMINISTIC_BASES
+    else:
+        bases = [random.randrange(2, n - 1) for _ in range(k)]
+    for a in bases:
         x = pow(a, d, n)
         if x == 1 or x == n - 1:
             continue
@@ -53,16 +85,113 @@ def generate_prime(bits):
         if is_prime(p):
             return p
 
-def generate_rsa_keys(bits=512):
+def _prime_search_task(bits, batch):
+    """
+    Проверяет batch кандидатов из криптостойкого генератора (secrets): простые
+    становятся ключами RSA/Эль-Гамаля; возвращает простое или None.
+    """
+    for _ in range(batch):
+        p = secrets.randbits(bits)
+        p |= (1 << bits - 1) | 1
+        if is_prime(p):
+            return p
+    return None
+
+def generate_primes_parallel(bits, count=1, workers=None, batch=16):
+    """
+    Ищет count различных простых в пуле процессов.
+    Каждое задание проверяет batch случайных кандидатов (secrets.randbits),
+    в работе держится 2 * workers заданий. Как только найдено count простых,
+    пул завершается (terminate), оставшиеся задания отменяются.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = queue.Queue()
+    found = []
+    with Pool(workers) as pool:
+        def submit():
+            pool.apply_async(_prime_search_task, (bits, batch),
+                             callback=results.put, error_callback=results.put)
+        for _ in range(2 * workers):
+            submit()
+        while len(found) < count:
+            p = results.get()
+            if isinstance(p, BaseException):
+                raise p
+            if p is not None and p not in found:
+                found.append(p)
+            submit()
+    return found
+
+# Пул процессов окупается, только если последовательный поиск заметно дольше его
+# запуска и остановки (15-60 мс): по benchmark_parallel_keygen (ниже) — с 768 бит.
+# На одноядерной машине (workers = cpu_count() = 1) поиск всегда последовательный.
+PARALLEL_MIN_BITS = 768
+
+def generate_rsa_keys(bits=512, workers=1):
     print("Генерация ключей RSA...")
-    p = generate_prime(bits)
-    q = generate_prime(bits)
+    if workers > 1 and bits >= PARALLEL_MIN_BITS:
+        p, q = generate_primes_parallel(bits, 2, workers)
+    else:
+        p = generate_prime(bits)
+        q = generate_prime(bits)
     n = p * q
     phi = (p - 1) * (q - 1)
     e = 65537
     d = modinv(e, phi)
     print("Ключи сгенерированы!")
-    return (n, e), (n, d)
+    if p == q or e > CRT_MAX_E:
+        return (n, e), (n, d)
+    crt = crt_components(p, q, d)
+    crt['e'] = e
+    return (n, e), (n, d, crt)
+
+def batch_pow(values, e, n):
+    """[v^e mod n for v in values]; одинаковые значения возводятся в степень один раз."""
+    cache = {}
+    result = []
+    for v in values:
+        r = cache.get(v)
+        if r is None:
+            r = cache[v] = pow(v, e, n)
+        result.append(r)
+    return result
+
+# КТО выгоден, только пока проверка m^e mod n дешёвая: при e порядка n она стоит
+# как само pow(c, d, n).
+CRT_MAX_E = 1 << 17
+
+def crt_components(p, q, d):
+    """CRT-компоненты закрытого ключа: dP = d mod (p-1), dQ = d mod (q-1), qInv = q^-1 mod p."""
+    return {'p': p, 'q': q, 'dP': d % (p - 1), 'dQ': d % (q - 1), 'qInv': modinv(q, p)}
+
+def rsa_crt_pow(c, key):
+    """
+    c^d mod n по КТО: два возведения по модулям p и q с половинными показателями
+    и рекомбинация Гарнера. Перед выдачей результат проверяется (m^e mod n == c),
+    чтобы сбой в вычислениях не раскрыл p или q.
+    """
+    p, q = key['p'], key['q']
+    m1 = pow(c, key['dP'], p)
+    m2 = pow(c, key['dQ'], q)
+    h = (key['qInv'] * (m1 - m2)) % p
+    m = m2 + h * q
+    n = p * q
+    if pow(m, key['e'], n) != c % n:
+        raise ValueError("Ошибка вычисления по КТО: результат не прошёл проверку")
+    return m
+
+def rsa_private_batch(values, n, d, crt=None):
+    """Операция закрытого ключа для списка значений (по КТО, если заданы компоненты crt)."""
+    if crt is None:
+        return batch_pow(values, d, n)
+    cache = {}
+    result = []
+    for v in values:
+        r = cache.get(v)
+        if r is None:
+            r = cache[v] = rsa_crt_pow(v, crt)
+        result.append(r)
+    return result
 
 # =========================
 # Хеш и подпись
@@ -75,9 +204,10 @@ def hash_file(filename):
     return sha.digest()
 
 def sign_file(filename, private_key, signature_file):
-    n, d = private_key
+    n, d = private_key[:2]
+    crt = private_key[2] if len(private_key) > 2 else None
     file_hash = hash_file(filename)
-    signature = [pow(byte, d, n) for byte in file_hash]
+    signature = rsa_private_batch(file_hash, n, d, crt)
     with open(signature_file, "w") as f:
         f.write(",".join(map(str, signature)))
     print(f"Файл '{filename}' подписан. Подпись сохранена в '{signature_file}'.")
@@ -89,10 +219,26 @@ def verify_file(filename, public_key, signature_file):
         signature = list(map(int, f.read().split(",")))
     if len(file_hash) != len(signature):
         return False
-    for byte, sig_byte in zip(file_hash, signature):
-        if pow(sig_byte, e, n) != byte:
-            return False
-    return True
+    return all(m == byte for byte, m in zip(file_hash, batch_pow(signature, e, n)))
+
+
+def benchmark_parallel_keygen(bits=1024, max_workers=None, trials=3):
+    """Время генерации пары простых для RSA в зависимости от числа процессов."""
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"Ядер: {os.cpu_count()}, длина простых: {bits} бит, попыток: {trials}")
+    print(f"{'процессов':>10} | {'время, с':>10} | ускорение")
+    results = {}
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        for _ in range(trials):
+            if workers == 1:
+                generate_prime(bits)
+                generate_prime(bits)
+            else:
+                generate_primes_parallel(bits, 2, workers)
+        results[workers] = (time.perf_counter() - start) / trials
+        print(f"{workers:>10} | {results[workers]:>10.3f} | x{results[1] / results[workers]:.2f}")
+    return results
 
 
 def main():
@@ -104,10 +250,11 @@ def main():
         print("2. Подписать файл")
         print("3. Проверить подпись файла")
         print("4. Выйти")
-        choice = input("Выберите действие (1-4): ")
+        print("5. Бенчмарк параллельной генерации ключей")
+        choice = input("Выберите действие (1-5): ")
 
         if choice == "1":
-            public_key, private_key = generate_rsa_keys(bits=512)
+            public_key, private_key = generate_rsa_keys(bits=512, workers=os.cpu_count() or 1)
             print(f"Публичный ключ: {public_key}")
             print(f"Приватный ключ: {private_key}")
 
@@ -140,6 +287,10 @@ def main():
             print("Выход из программы.")
             break
 
+        elif choice == "5":
+            bits = int(input("Длина простых в битах (например 1024): ") or "1024")
+            benchmark_parallel_keygen(bits)
+
         else:
             print("Неверный выбор. Попробуйте снова.")
 
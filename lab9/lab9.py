@@ -1,8 +1,11 @@
 import hashlib
 import json
 import random
-from math import gcd
+import secrets
+from math import gcd, prod
+from multiprocessing import Pool
 import os
+import queue
 
 def mod_inverse(a, m):
     """Обратный элемент по модулю m"""
@@ -11,25 +14,104 @@ def mod_inverse(a, m):
         raise ValueError("Обратного элемента не существует")
     return x % m
 
+def mod_inv_batch(values, m):
+    """Обратные элементы для списка values по модулю m (трюк Монтгомери: одна инверсия)"""
+    if not values:
+        return []
+    prefix = []
+    acc = 1
+    for v in values:
+        acc = (acc * v) % m
+        prefix.append(acc)
+    inv = mod_inverse(acc, m)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = (inv * prefix[i - 1]) % m
+        inv = (inv * values[i]) % m
+    result[0] = inv
+    return result
+
 def extended_gcd(a, b):
-    if b == 0:
-        return a, 1, 0
-    g, x1, y1 = extended_gcd(b, a % b)
-    return g, y1, x1 - (a // b) * y1
+    """Итеративный обобщённый алгоритм Евклида: a*x + b*y = g"""
+    x0, x1 = 1, 0
+    y0, y1 = 0, 1
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+# Для модулей до этой длины два встроенных pow быстрее интерпретируемого цикла Штрауса
+MULTI_POW_MIN_BITS = 256
+
+def multi_pow(pairs, p):
+    """
+    g1^e1 * g2^e2 * ... mod p за один проход с общей цепочкой возведений в квадрат
+    (трюк Шамира/Штрауса), показатели e >= 0.
+    """
+    if p.bit_length() <= MULTI_POW_MIN_BITS:
+        result = 1 % p
+        for g, e in pairs:
+            result = (result * pow(g, e, p)) % p
+        return result
+    pairs = [(g % p, e) for g, e in pairs if e]
+    if not pairs:
+        return 1 % p
+    bits = max(e.bit_length() for _, e in pairs)
+    w = 1 if bits <= 8 else 2 if bits <= 24 else 3 if bits <= 80 else 4 if bits <= 240 else 5
+    tables = []
+    for g, _ in pairs:
+        table = [1, g]
+        for _ in range((1 << w) - 2):
+            table.append((table[-1] * g) % p)
+        tables.append(table)
+    mask = (1 << w) - 1
+    result = 1
+    for i in range((bits + w - 1) // w - 1, -1, -1):
+        if result != 1:
+            for _ in range(w):
+                result = (result * result) % p
+        shift = i * w
+        for (_, e), table in zip(pairs, tables):
+            d = (e >> shift) & mask
+            if d:
+                result = (result * table[d]) % p
+    return result % p
+
+def _sieve_primes(limit):
+    """Решето Эратосфена: все простые < limit."""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+# Первые 2048 простых: отсев кандидата одним gcd с их произведением
+SMALL_PRIMES = _sieve_primes(17864)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_PRIMORIAL = prod(SMALL_PRIMES)
+# Основания 2..41 дают точный ответ Миллера–Рабина для n < MR_DETERMINISTIC_LIMIT
+MR_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
 
 def is_prime(n, k=10):
-    """Проверка простоты числа тестом Миллера-Рабина"""
+    """Проверка простоты числа тестом Миллера-Рабина (с отсевом по малым простым)"""
     if n < 2:
         return False
-    for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]:
-        if n % p == 0:
-            return n == p
+    if n <= SMALL_PRIMES[-1]:
+        return n in _SMALL_PRIMES_SET
+    if gcd(n, _PRIMORIAL) != 1:
+        return False
     r, s = 0, n - 1
     while s % 2 == 0:
         r += 1
         s //= 2
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
+    if n < MR_DETERMINISTIC_LIMIT:
+        bases = MR_DETERMINISTIC_BASES
+    else:
+        bases = [random.randrange(2, n - 1) for _ in range(k)]
+    for a in bases:
         x = pow(a, s, n)
         if x in (1, n - 1):
             continue
@@ -49,9 +131,51 @@ def generate_prime(bits=256):
         if is_prime(n):
             return n
 
-def generate_keys(bits=256):
+def _prime_search_task(bits, batch):
+    """
+    Проверяет batch кандидатов из криптостойкого генератора (secrets): простые
+    становятся ключами RSA/Эль-Гамаля; возвращает простое или None
+    """
+    for _ in range(batch):
+        n = secrets.randbits(bits)
+        n |= 1
+        if is_prime(n):
+            return n
+    return None
+
+def generate_primes_parallel(bits, count=1, workers=None, batch=16):
+    """
+    Ищет count различных простых в пуле процессов.
+    Каждое задание проверяет batch случайных кандидатов (secrets.randbits),
+    в работе держится 2 * workers заданий. Как только найдено count простых,
+    пул завершается (terminate), оставшиеся задания отменяются.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = queue.Queue()
+    found = []
+    with Pool(workers) as pool:
+        def submit():
+            pool.apply_async(_prime_search_task, (bits, batch),
+                             callback=results.put, error_callback=results.put)
+        for _ in range(2 * workers):
+            submit()
+        while len(found) < count:
+            p = results.get()
+            if isinstance(p, BaseException):
+                raise p
+            if p is not None and p not in found:
+                found.append(p)
+            submit()
+    return found
+
+# Пул процессов окупается, только если последовательный поиск заметно дольше его
+# запуска и остановки (15-60 мс): по benchmark_parallel_keygen (Лаб.8) — с 768 бит.
+# На одноядерной машине (workers = cpu_count() = 1) поиск всегда последовательный.
+PARALLEL_MIN_BITS = 768
+
+def generate_keys(bits=256, workers=1):
     print("Генерация ключей, подождите...")
-    p = generate_prime(bits)
+    p = generate_primes_parallel(bits, 1, workers)[0] if workers > 1 and bits >= PARALLEL_MIN_BITS else generate_prime(bits)
     g = random.randint(2, p - 2)
     x = random.randint(2, p - 2)
     y = pow(g, x, p)
@@ -89,13 +213,17 @@ def sign_file():
     signature = []
 
     print("Подписание файла...")
-    for m in hash_bytes:
+    ks = []
+    for _ in hash_bytes:
         while True:
             k = random.randint(2, p - 2)
             if gcd(k, p - 1) == 1:
                 break
+        ks.append(k)
+    k_invs = mod_inv_batch(ks, p - 1)
+    for m, k, k_inv in zip(hash_bytes, ks, k_invs):
         r = pow(g, k, p)
-        s = (mod_inverse(k, p - 1) * (m - x * r)) % (p - 1)
+        s = (k_inv * (m - x * r)) % (p - 1)
         signature.append((r, s))
 
     sig_filename = filename + ".sig"
@@ -128,7 +256,7 @@ def verify_file():
 
     print("Проверка подписи...")
     for m, (r, s) in zip(hash_bytes, signature):
-        left = (pow(y, r, p) * pow(r, s, p)) % p
+        left = multi_pow([(y, r), (r, s)], p)
         right = pow(g, m, p)
         if left != right:
             print("Подпись недействительна.")
@@ -148,7 +276,7 @@ def main():
         choice = input("Выберите действие: ").strip()
 
         if choice == "1":
-            generate_keys()
+            generate_keys(workers=os.cpu_count() or 1)
         elif choice == "2":
             sign_file()
         elif choice == "3":